@@ -0,0 +1 @@
+"""Benchmarks of the generator, the generated package and the example solver loops, see `python -m benchmarks --help`."""
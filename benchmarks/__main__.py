@@ -0,0 +1,99 @@
+import sys
+import logging
+import tempfile
+import argparse
+from pathlib import Path
+
+from .common import Measurement, write_results, load_results, format_table
+
+logger = logging.getLogger("benchmarks")
+
+SUITES = ('generator', 'simulation', 'c_solver')
+
+
+def run(args) -> int:
+    measurements: list[Measurement] = []
+
+    if 'generator' in args.suites:
+        from .bench_generator import bench_generator
+        logger.info("Running generator benchmarks...")
+        measurements += bench_generator(repeat=args.repeat, solver_json=args.solver_json, num_obstacles=args.num_obstacles)
+
+    if 'simulation' in args.suites or 'c_solver' in args.suites:
+        from .bench_solver import acados_available, bench_closed_loop, bench_c_solve
+        if not acados_available():
+            logger.warning("acados_template or ACADOS_SOURCE_DIR not available, skipping the solver benchmarks.")
+        else:
+            with tempfile.TemporaryDirectory(prefix='nodegen_bench_solver_') as tmp:
+                work_dir = Path(args.work_dir) if args.work_dir else Path(tmp)
+                for encoding in args.encodings:
+                    logger.info(f"Running closed-loop benchmarks ({encoding})...")
+                    loop_measurements, code_dirs = bench_closed_loop(
+                        work_dir, args.horizons, encoding, args.num_obstacles, args.N_sim, args.sim_repeat
+                    )
+                    if 'simulation' in args.suites:
+                        measurements += loop_measurements
+                    if 'c_solver' in args.suites:
+                        logger.info(f"Running C solve benchmarks ({encoding})...")
+                        measurements += bench_c_solve(code_dirs, encoding, args.num_obstacles, args.num_solves)
+
+    print(format_table(measurements))
+    if args.output:
+        write_results(args.output, measurements)
+        logger.info(f"Results written to '{args.output}'.")
+    return 0
+
+
+def compare(args) -> int:
+    """Relative change of every measurement present in both files, slower than threshold counts as regression."""
+    base_env, base = load_results(args.baseline)
+    new_env, new = load_results(args.results)
+    print(f"Baseline: {base_env.get('commit', '?')[:10]}  Results: {new_env.get('commit', '?')[:10]}")
+    if base_env.get('cpu') != new_env.get('cpu'):
+        print(f"Warning: measured on different CPUs ({base_env.get('cpu')} vs. {new_env.get('cpu')})")
+
+    regressions = 0
+    print(f"{'Benchmark':<70} {'Baseline':>12} {'Results':>12} {'Change':>9}")
+    for key in sorted(base.keys() & new.keys()):
+        b, n = base[key], new[key]
+        change = (n.value - b.value) / b.value if b.value else 0.0
+        # Only timings can regress, sizes and counts are informational
+        regression = n.unit in ('s', 'us') and change > args.threshold
+        regressions += regression
+        print(f"{key:<70} {b.value:>12.4g} {n.value:>12.4g} {change:>+8.1%}{'  <-- slower' if regression else ''}")
+    for key in sorted(new.keys() - base.keys()):
+        print(f"{key:<70} {'':>12} {new[key].value:>12.4g}      new")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmarks of ros_acados_nodegen and the safety filter example.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the benchmarks.")
+    run_parser.add_argument('--suites', nargs='+', choices=SUITES, default=list(SUITES), help="Benchmarks to run.")
+    run_parser.add_argument('-o', '--output', type=Path, default=None, help="Write the results as JSON to this path.")
+    run_parser.add_argument('--repeat', type=int, default=20, help="Repetitions of each generator measurement.")
+    run_parser.add_argument('--solver_json', type=Path, default=None, help="Acados solver JSON for the generator benchmarks, defaults to a synthetic one.")
+    run_parser.add_argument('--num_obstacles', type=int, default=10, help="Number of obstacles of the OCP.")
+    run_parser.add_argument('--horizons', type=int, nargs='+', default=[10, 20, 40], help="Horizon lengths of the solver benchmarks.")
+    run_parser.add_argument('--encodings', nargs='+', default=['points'], choices=['points', 'circles', 'distance_field'], help="Obstacle encodings of the solver benchmarks.")
+    run_parser.add_argument('--N_sim', type=int, default=100, help="Closed-loop steps per simulation.")
+    run_parser.add_argument('--sim_repeat', type=int, default=5, help="Repetitions of each closed-loop simulation.")
+    run_parser.add_argument('--num_solves', type=int, default=1000, help="Solves of the C harness.")
+    run_parser.add_argument('--work_dir', type=Path, default=None, help="Keep the generated solvers in this directory.")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two result files.")
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('results', type=Path)
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="Relative slowdown reported as regression.")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
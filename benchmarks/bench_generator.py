@@ -0,0 +1,118 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from .common import EXAMPLE_DIR, Measurement, time_samples
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = EXAMPLE_DIR / 'safety_filter_node_config.yaml'
+SCRIPT_PATH = EXAMPLE_DIR / 'scripts' / 'safety_filter_mpc.py'
+
+
+def synthetic_solver_json(path: Path, num_obstacles: int = 10, N_horizon: int = 20) -> Path:
+    """
+    Writes a solver JSON with the fields the generator reads, sized like the safety filter OCP.
+
+    Keeps the generator benchmark independent of an acados installation.
+    """
+    nx, nu, nh = 5, 2, 2 * num_obstacles
+    ny_0, ny = 2 * nu, nu
+
+    def diag(values):
+        return [[values[i] if i == j else 0.0 for j in range(len(values))] for i in range(len(values))]
+
+    data = {
+        'model': {'name': 'agilex'},
+        'dims': {'nx': nx, 'nu': nu, 'np': 2 * num_obstacles + 2, 'nh': nh, 'N': N_horizon},
+        'solver': {'nlp_solver_type': 'SQP_RTI', 'Tsim': 0.1},
+        'solver_options': {'N_horizon': N_horizon, 'tf': 0.1 * N_horizon},
+        'constraints': {
+            'lbu': [-1.0, -1.5], 'ubu': [1.0, 1.5],
+            'lbx': [-1.0, -1.5], 'ubx': [1.0, 1.5],
+            'lbx_0': [0.0] * nx, 'ubx_0': [0.0] * nx,
+            'lh': [0.2] * nh, 'uh': [1e4] * nh,
+            'lsh': [0.0] * nh, 'ush': [1e4] * nh,
+        },
+        'cost': {
+            'W_0': diag([15.0, 0.1, 10.0, 0.3]), 'W': diag([10.0, 0.3]),
+            'yref_0': [0.0] * ny_0, 'yref': [0.0] * ny,
+            'zl': [1e3] * nh, 'zu': [1e3] * nh, 'Zl': diag([1e3] * nh), 'Zu': diag([1e3] * nh),
+        },
+        'parameter_values': [0.0] * (2 * num_obstacles + 2),
+    }
+    path.write_text(json.dumps(data))
+    return path
+
+
+def _load_context(solver_json: Path):
+    from ros_acados_nodegen.context import RosPackageContext, AcadosContext
+
+    context = RosPackageContext.from_yaml(CONFIG_PATH)
+    context.acados = AcadosContext.from_solver_json(solver_json)
+    context.script_path = str(SCRIPT_PATH)
+    return context
+
+
+def _package_size(package_path: Path) -> tuple[int, int]:
+    files = [p for p in package_path.rglob('*') if p.is_file()]
+    return sum(p.stat().st_size for p in files), len(files)
+
+
+def bench_generator(repeat: int = 20, solver_json: Path | None = None, num_obstacles: int = 10) -> list[Measurement]:
+    """
+    Render time per template, full generation time and size of the generated package.
+
+    Parameters
+    ----------
+    solver_json: Path, optional
+        Real acados solver JSON, defaults to a synthetic safety filter JSON with num_obstacles obstacles.
+    """
+    from ros_acados_nodegen.renderer.paths import TEMPLATES_DIR
+    from ros_acados_nodegen.renderer.package_generator import RosPackageGenerator, get_jinja_env, JINJA_SUFFIX
+
+    measurements = []
+    with tempfile.TemporaryDirectory(prefix='nodegen_bench_') as tmp:
+        tmp = Path(tmp)
+        params = {'solver': solver_json.name} if solver_json else {'num_obstacles': num_obstacles}
+        if solver_json is None:
+            solver_json = synthetic_solver_json(tmp / 'solver.json', num_obstacles)
+        context = _load_context(solver_json)
+
+        samples = time_samples(context.model_dump, repeat)
+        measurements.append(Measurement.from_samples('generator', 'context.model_dump', samples, 's', **params))
+
+        env = get_jinja_env()
+        data = context.model_dump()
+        for template_path in sorted(TEMPLATES_DIR.glob('*' + JINJA_SUFFIX)):
+            template = env.get_template(template_path.name)
+            samples = time_samples(lambda: template.render(**data), repeat)
+            measurements.append(Measurement.from_samples('generator.render', template_path.name, samples, 's', **params))
+
+        generated = []
+
+        def generate_fresh():
+            generator = RosPackageGenerator(context, tmp / f'cold_{len(generated)}')
+            generator.generate_all(force=True)
+            generated.append(generator.package_path)
+
+        samples = time_samples(generate_fresh, repeat, warmup=0)
+        measurements.append(Measurement.from_samples('generator', 'generate_all.fresh', samples, 's', **params))
+
+        generator = RosPackageGenerator(context, tmp / 'warm')
+        generator.generate_all()
+        samples = time_samples(generator.generate_all, repeat)
+        measurements.append(Measurement.from_samples('generator', 'generate_all.up_to_date', samples, 's', **params))
+        samples = time_samples(lambda: generator.generate_all(force=True), repeat)
+        measurements.append(Measurement.from_samples('generator', 'generate_all.unchanged_force', samples, 's', **params))
+
+        size, num_files = _package_size(generator.package_path)
+        measurements.append(Measurement('package', 'size', size, 'bytes', params))
+        measurements.append(Measurement('package', 'files', num_files, 'files', params))
+        for rel in sorted(generator._generated_files):
+            path = generator.package_path / rel
+            if path.is_file() and not rel.startswith('scripts/'):
+                measurements.append(Measurement('package.file_size', rel, path.stat().st_size, 'bytes', params))
+
+    return measurements
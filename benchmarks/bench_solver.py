@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import subprocess
+import numpy as np
+from pathlib import Path
+
+from .common import EXAMPLE_DIR, Measurement
+
+logger = logging.getLogger(__name__)
+
+HARNESS_SOURCE = Path(__file__).resolve().parent / 'harness' / 'solve_benchmark.c'
+MODEL_NAME = 'agilex'
+
+
+def acados_available() -> bool:
+    try:
+        import acados_template  # noqa: F401
+    except ImportError:
+        return False
+    return bool(os.environ.get('ACADOS_SOURCE_DIR'))
+
+
+def _example_setup():
+    """Map, initial state and safety radius of safety_filter_mpc.py."""
+    scripts_dir = str(EXAMPLE_DIR / 'scripts')
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    from safety_filter_scripts.safety_filter_ocp import MapInfo
+
+    occupancy_map = np.zeros((100, 100))
+    occupancy_map[20:50, 30:50] = 1
+    map_info = MapInfo(np.array([0.0, 0.0]), occupancy_map, 0.1)
+    safety_radius = map_info.resolution * np.sqrt(2) + 0.3
+    x0 = np.array([0.0, 0.0, np.pi / 4, 0.5, 0.0])
+    return map_info, safety_radius, x0
+
+
+def bench_closed_loop(
+        work_dir: Path,
+        horizons: list[int],
+        obstacle_encoding: str = "points",
+        num_obstacles: int = 10,
+        N_sim: int = 100,
+        repeat: int = 5,
+        dt: float = 0.1,
+) -> tuple[list[Measurement], dict[int, Path]]:
+    """
+    Build time and closed-loop step time of simulate() for each horizon length.
+
+    Returns the measurements and the code export directory per horizon for bench_c_solve.
+    """
+    map_info, safety_radius, x0 = _example_setup()
+    from safety_filter_mpc import setup_weights
+    from safety_filter_scripts.safety_filter_ocp import (
+        create_solver, create_sim, simulate, generate_unsafe_trajectory, get_obstacle_parameters
+    )
+
+    unsafe_inputs, _ = generate_unsafe_trajectory(dt, x0, map_info)
+    R_ref, R_delta = setup_weights()
+
+    measurements = []
+    code_dirs = {}
+    for N_horizon in horizons:
+        params = {'N': N_horizon, 'encoding': obstacle_encoding, 'num_obstacles': num_obstacles}
+        code_dir = work_dir / f'{obstacle_encoding}_N{N_horizon}'
+        start = time.perf_counter()
+        ocp_solver = create_solver(
+            N_horizon, dt, num_obstacles, safety_radius**2, R_ref, R_delta, str(code_dir),
+            obstacle_encoding=obstacle_encoding, distance_field_resolution=map_info.resolution,
+        )
+        sim_solver = create_sim(dt, str(code_dir))
+        measurements.append(Measurement('solver', 'build', time.perf_counter() - start, 's', params))
+
+        step_samples = []
+        completed = 0
+        for _ in range(repeat):
+            ocp_solver.reset()
+            start = time.perf_counter()
+            _, _, x_sim = simulate(
+                x0, unsafe_inputs, map_info, safety_radius,
+                ocp_solver=ocp_solver, sim_solver=sim_solver, N_sim=N_sim,
+                obstacle_encoding=obstacle_encoding,
+            )
+            steps = max(1, np.count_nonzero(~np.isnan(x_sim[1:, 0])))
+            step_samples.append((time.perf_counter() - start) / steps)
+            completed = steps
+        measurements.append(Measurement.from_samples('simulation', 'step', step_samples, 's', **params))
+        measurements.append(Measurement('simulation', 'completed_steps', completed, 'steps', params))
+
+        # Eingabedatei fuer den C-Harness: x0, p und lh am Startzustand
+        p_values, lh_values = get_obstacle_parameters(ocp_solver, map_info, x0[:2], safety_radius, obstacle_encoding)
+        with open(code_dir / 'benchmark_input.txt', 'w') as f:
+            for values in (x0, p_values, lh_values):
+                f.write(' '.join(repr(float(v)) for v in values) + '\n')
+        code_dirs[N_horizon] = code_dir
+
+    return measurements, code_dirs
+
+
+def build_harness(code_dir: Path, model_name: str = MODEL_NAME) -> Path:
+    """Compiles the standalone solve benchmark against the generated solver library in code_dir."""
+    acados_dir = Path(os.environ['ACADOS_SOURCE_DIR'])
+    executable = code_dir / 'solve_benchmark'
+    cc = os.environ.get('CC') or shutil.which('cc') or 'gcc'
+    cmd = [
+        cc, '-O2', str(HARNESS_SOURCE), '-o', str(executable),
+        f'-DMODEL={model_name}', f'-DSOLVER_HEADER="acados_solver_{model_name}.h"',
+        f'-I{code_dir}',
+        f'-I{acados_dir / "include"}',
+        f'-I{acados_dir / "include" / "blasfeo" / "include"}',
+        f'-I{acados_dir / "include" / "hpipm" / "include"}',
+        f'-L{code_dir}', f'-L{acados_dir / "lib"}',
+        f'-lacados_ocp_solver_{model_name}', '-lacados', '-lhpipm', '-lblasfeo', '-lm',
+        f'-Wl,-rpath,{code_dir}', f'-Wl,-rpath,{acados_dir / "lib"}',
+    ]
+    subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return executable
+
+
+def bench_c_solve(code_dirs: dict[int, Path], obstacle_encoding: str, num_obstacles: int, num_solves: int = 1000) -> list[Measurement]:
+    """Solve time of the generated C solver, measured by the standalone harness without ROS and Python."""
+    measurements = []
+    for N_horizon, code_dir in code_dirs.items():
+        params = {'N': N_horizon, 'encoding': obstacle_encoding, 'num_obstacles': num_obstacles}
+        try:
+            executable = build_harness(code_dir)
+            output = subprocess.run(
+                [str(executable), str(num_solves), str(code_dir / 'benchmark_input.txt')],
+                check=True, capture_output=True, text=True
+            ).stdout
+        except subprocess.CalledProcessError as e:
+            logger.error(f"C solve benchmark for N={N_horizon} failed:\n{e.stderr}")
+            continue
+        result = json.loads(output)
+        wall_us = result['wall_us']
+        stats = {'min': wall_us['min'], 'mean': wall_us['mean'], 'max': wall_us['max'], 'p99': wall_us['p99'], 'samples': result['num_solves']}
+        measurements.append(Measurement('c_solver', 'solve', wall_us['p50'], 'us', params, stats))
+        measurements.append(Measurement('c_solver', 'time_tot', result['time_tot_us'], 'us', params))
+        measurements.append(Measurement('c_solver', 'time_qp', result['time_qp_us'], 'us', params))
+        measurements.append(Measurement('c_solver', 'failures', result['failures'], 'solves', params))
+    return measurements
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import platform
+import statistics
+import subprocess
+from typing import Any, Callable
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EXAMPLE_DIR = REPO_ROOT / 'examples' / 'safety_filter'
+RESULTS_VERSION = 1
+
+
+@dataclass
+class Measurement:
+    """
+    One benchmark value, e.g. benchmark="generator.render", name="node.cpp.j2".
+
+    value is the median of the samples, params hold the benchmark settings (horizon, encoding, ...)
+    and are part of the key, so only measurements with the same settings are compared.
+    """
+    benchmark: str
+    name: str
+    value: float
+    unit: str
+    params: dict[str, Any] = field(default_factory=dict)
+    stats: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        params = ','.join(f'{k}={v}' for k, v in sorted(self.params.items()))
+        return f'{self.benchmark}/{self.name}' + (f'[{params}]' if params else '')
+
+    @classmethod
+    def from_samples(cls, benchmark: str, name: str, samples: list[float], unit: str, **params) -> 'Measurement':
+        ordered = sorted(samples)
+        stats = {
+            'min': ordered[0],
+            'mean': statistics.fmean(ordered),
+            'max': ordered[-1],
+            'p99': ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+            'samples': len(ordered),
+        }
+        return cls(benchmark, name, statistics.median(ordered), unit, params, stats)
+
+
+def time_samples(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> list[float]:
+    """Wall times of repeat calls of fn in seconds, after warmup untimed calls."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ['git', '-C', str(REPO_ROOT), *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def _cpu_model() -> str:
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def environment_info() -> dict[str, Any]:
+    """Commit and machine the results were measured on."""
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu': _cpu_model(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(path: Path, measurements: list[Measurement]):
+    data = {
+        'version': RESULTS_VERSION,
+        'environment': environment_info(),
+        'measurements': [asdict(m) for m in measurements],
+    }
+    Path(path).write_text(json.dumps(data, indent=2) + '\n')
+
+
+def load_results(path: Path) -> tuple[dict[str, Any], dict[str, Measurement]]:
+    """Environment info and the measurements keyed by Measurement.key."""
+    data = json.loads(Path(path).read_text())
+    measurements = [Measurement(**m) for m in data.get('measurements', [])]
+    return data.get('environment', {}), {m.key: m for m in measurements}
+
+
+def format_table(measurements: list[Measurement]) -> str:
+    lines = [f"{'Benchmark':<70} {'Median':>12} {'Min':>12}  Unit"]
+    for m in measurements:
+        minimum = f"{m.stats['min']:>12.4g}" if 'min' in m.stats else f"{'':>12}"
+        lines.append(f"{m.key:<70} {m.value:>12.4g} {minimum}  {m.unit}")
+    return '\n'.join(lines)
@@ -0,0 +1,141 @@
+/*
+ * Standalone solve time benchmark of a generated acados OCP solver, without ROS.
+ *
+ * Build with -DMODEL=<model name> -DSOLVER_HEADER='"acados_solver_<model name>.h"'.
+ *
+ * Usage: solve_benchmark <num_solves> [input file]
+ * The optional input file has three lines with space separated values:
+ *   x0, parameter values p (set for all stages) and lh (set for stages 1..N-1).
+ * An empty line keeps the values of the solver JSON.
+ * The result is printed as one JSON object on stdout.
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "acados_c/ocp_nlp_interface.h"
+#include SOLVER_HEADER
+
+#define CONCAT_(a, b) a##b
+#define CONCAT(a, b) CONCAT_(a, b)
+#define SOLVER_FN(name) CONCAT(MODEL, CONCAT(_acados_, name))
+#define STRINGIFY_(a) #a
+#define STRINGIFY(a) STRINGIFY_(a)
+
+#define MAX_LINE_VALUES 65536
+
+static int read_line_values(FILE *f, double *values, int max_values)
+{
+    static char line[MAX_LINE_VALUES * 24];
+    int n = 0;
+    if (!fgets(line, sizeof(line), f))
+        return 0;
+    char *cursor = line;
+    char *end = NULL;
+    while (n < max_values)
+    {
+        double value = strtod(cursor, &end);
+        if (end == cursor)
+            break;
+        values[n++] = value;
+        cursor = end;
+    }
+    return n;
+}
+
+static double elapsed_us(const struct timespec *start, const struct timespec *stop)
+{
+    return (stop->tv_sec - start->tv_sec) * 1e6 + (stop->tv_nsec - start->tv_nsec) * 1e-3;
+}
+
+static int compare_double(const void *a, const void *b)
+{
+    double da = *(const double *)a, db = *(const double *)b;
+    return (da > db) - (da < db);
+}
+
+int main(int argc, char **argv)
+{
+    int num_solves = argc > 1 ? atoi(argv[1]) : 1000;
+    if (num_solves <= 0)
+        num_solves = 1000;
+
+    CONCAT(MODEL, _solver_capsule) *capsule = SOLVER_FN(create_capsule)();
+    int status = SOLVER_FN(create)(capsule);
+    if (status)
+    {
+        fprintf(stderr, "acados_create() returned status %d\n", status);
+        return 1;
+    }
+
+    ocp_nlp_config *config = SOLVER_FN(get_nlp_config)(capsule);
+    ocp_nlp_dims *dims = SOLVER_FN(get_nlp_dims)(capsule);
+    ocp_nlp_in *in = SOLVER_FN(get_nlp_in)(capsule);
+    ocp_nlp_out *out = SOLVER_FN(get_nlp_out)(capsule);
+    ocp_nlp_solver *solver = SOLVER_FN(get_nlp_solver)(capsule);
+    const int N = dims->N;
+
+    if (argc > 2)
+    {
+        FILE *f = fopen(argv[2], "r");
+        if (!f)
+        {
+            fprintf(stderr, "Cannot open input file '%s'\n", argv[2]);
+            return 1;
+        }
+        double *values = malloc(MAX_LINE_VALUES * sizeof(double));
+        int n = read_line_values(f, values, MAX_LINE_VALUES);
+        if (n > 0)
+        {
+            ocp_nlp_constraints_model_set(config, dims, in, out, 0, "lbx", values);
+            ocp_nlp_constraints_model_set(config, dims, in, out, 0, "ubx", values);
+        }
+        n = read_line_values(f, values, MAX_LINE_VALUES);
+        for (int i = 0; n > 0 && i <= N; i++)
+            SOLVER_FN(update_params)(capsule, i, values, n);
+        n = read_line_values(f, values, MAX_LINE_VALUES);
+        for (int i = 1; n > 0 && i < N; i++)
+            ocp_nlp_constraints_model_set(config, dims, in, out, i, "lh", values);
+        free(values);
+        fclose(f);
+    }
+
+    double *wall_us = malloc(num_solves * sizeof(double));
+    double time_tot_sum = 0.0, time_qp_sum = 0.0;
+    int failures = 0;
+    struct timespec start, stop;
+
+    for (int k = 0; k < num_solves; k++)
+    {
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        status = SOLVER_FN(solve)(capsule);
+        clock_gettime(CLOCK_MONOTONIC, &stop);
+        wall_us[k] = elapsed_us(&start, &stop);
+        failures += status != 0;
+
+        double time_tot = 0.0, time_qp = 0.0;
+        ocp_nlp_get(solver, "time_tot", &time_tot);
+        ocp_nlp_get(solver, "time_qp", &time_qp);
+        time_tot_sum += time_tot;
+        time_qp_sum += time_qp;
+    }
+
+    double sum = 0.0;
+    for (int k = 0; k < num_solves; k++)
+        sum += wall_us[k];
+    qsort(wall_us, num_solves, sizeof(double), compare_double);
+
+    printf("{\"model\": \"%s\", \"N\": %d, \"num_solves\": %d, \"failures\": %d, "
+           "\"wall_us\": {\"min\": %.3f, \"p50\": %.3f, \"p99\": %.3f, \"max\": %.3f, \"mean\": %.3f}, "
+           "\"time_tot_us\": %.3f, \"time_qp_us\": %.3f}\n",
+           STRINGIFY(MODEL), N, num_solves, failures,
+           wall_us[0], wall_us[num_solves / 2], wall_us[(int)(0.99 * (num_solves - 1))],
+           wall_us[num_solves - 1], sum / num_solves,
+           1e6 * time_tot_sum / num_solves, 1e6 * time_qp_sum / num_solves);
+
+    free(wall_us);
+    SOLVER_FN(free)(capsule);
+    SOLVER_FN(free_capsule)(capsule);
+    return 0;
+}
@@ -30,6 +30,7 @@ if __name__ == "__main__":
     parser.add_argument('--gen_code_path', type=str, default=default_cgencode, help='The path for the generated c code.')
     parser.add_argument('-p', '--plot', action='store_true', help='Plot the occupancy map and the input references and resulting inputs.')
     parser.add_argument('--num_occ', type=int, default=10, help='The number of occupied fields used in the MPC.')
+    parser.add_argument('--obstacle_encoding', type=str, default='points', choices=['points', 'circles', 'distance_field'], help='Encode the obstacles as nearest occupied cells, clustered circles or a local distance field patch.')
     args = parser.parse_args()
     
     N_horizon = 20
@@ -46,7 +47,11 @@ if __name__ == "__main__":
     # --- Solver setup ---
     safety_radius = map_info.resolution * np.sqrt(2) + 0.3
     R_ref, R_delta = setup_weights()
-    ocp_solver = create_solver(N_horizon, dt, args.num_occ, safety_radius**2, R_ref, R_delta, args.gen_code_path)
+    ocp_solver = create_solver(
+        N_horizon, dt, args.num_occ, safety_radius**2, R_ref, R_delta, args.gen_code_path,
+        obstacle_encoding=args.obstacle_encoding,
+        distance_field_resolution=map_info.resolution,
+    )
     sim_solver = create_sim(dt*1.3, args.gen_code_path)
         
     x0 = np.array([0.0, 0.0, np.pi/4, 0.5, 0.0])
@@ -60,7 +65,8 @@ if __name__ == "__main__":
         ocp_solver=ocp_solver, 
         sim_solver=sim_solver,
         N_sim=100,
-        print_statistics=False
+        print_statistics=False,
+        obstacle_encoding=args.obstacle_encoding,
     )
 
     if args.plot:
@@ -1,8 +1,3 @@
-from .safety_filter_ocp.solver import create_sim, create_solver
-from .safety_filter_ocp.simulation import simulate
-from .safety_filter_ocp.helper import MapInfo, generate_unsafe_trajectory, get_stage_ref, normalize_angle
-from .plots import plot_inputs, plot_map
-
 __all__ = [
     "create_sim",
     "create_solver",
@@ -14,4 +9,24 @@ __all__ = [
     "get_stage_ref",
 
     "MapInfo",
-]
\ No newline at end of file
+]
+
+_MODULES = {
+    "create_sim": ".safety_filter_ocp",
+    "create_solver": ".safety_filter_ocp",
+    "simulate": ".safety_filter_ocp",
+    "MapInfo": ".safety_filter_ocp",
+    "generate_unsafe_trajectory": ".safety_filter_ocp",
+    "get_stage_ref": ".safety_filter_ocp",
+    "normalize_angle": ".safety_filter_ocp",
+    "plot_inputs": ".plots",
+    "plot_map": ".plots",
+}
+
+
+def __getattr__(name):
+    # Lazy imports, the map helpers are usable without acados_template and matplotlib
+    if name in _MODULES:
+        import importlib
+        return getattr(importlib.import_module(_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
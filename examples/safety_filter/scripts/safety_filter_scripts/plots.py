@@ -50,7 +50,6 @@ def plot_map(
             ax.plot(optim_traj[:, 0], optim_traj[:, 1], 'c-')
 
     if map_info.obstacle_positions.size > 0:
-        map_info.obstacle_positions = np.vstack(map_info.obstacle_positions)
         ax.plot(map_info.obstacle_positions[:, 0], map_info.obstacle_positions[:, 1], 'yo', markersize=4, label='Obstacle points')
 
     if unsafe_path is not None:
@@ -1,14 +1,37 @@
-from .solver import create_solver, create_sim
-from .simulation import simulate
-from .helper import MapInfo, generate_unsafe_trajectory, normalize_angle, get_stage_ref, get_relevant_obstacles
-
 __all__ = [
     "create_solver",
     "create_sim",
     "simulate",
+    "get_obstacle_parameters",
+    "simulate_batch",
+    "scenario_sweep",
+    "Scenario",
+    "BatchResults",
     "generate_unsafe_trajectory",
     "normalize_angle",
     "get_stage_ref",
     "get_relevant_obstacles",
+    "get_distance_patch",
+    "cluster_obstacles",
     "MapInfo",
-]
\ No newline at end of file
+    "ObstacleIndex",
+]
+
+_MODULES = {
+    "create_solver": ".solver",
+    "create_sim": ".solver",
+    "simulate": ".simulation",
+    "get_obstacle_parameters": ".simulation",
+    "simulate_batch": ".batch_simulation",
+    "scenario_sweep": ".batch_simulation",
+    "Scenario": ".batch_simulation",
+    "BatchResults": ".batch_simulation",
+}
+
+
+def __getattr__(name):
+    # Lazy imports, only the solver module needs acados_template and CasADi at import time
+    if name in __all__:
+        import importlib
+        return getattr(importlib.import_module(_MODULES.get(name, ".helper"), __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import os
+import time
+import logging
+import itertools
+import numpy as np
+import scipy.linalg as spl
+
+from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+
+from .helper import MapInfo, generate_unsafe_trajectory
+from .simulation import simulate
+
+if TYPE_CHECKING:
+    from acados_template import AcadosOcpSolver, AcadosSimSolver
+
+
+batch_logger = logging.getLogger("SF.BATCH")
+
+
+@dataclass
+class Scenario:
+    init_state: np.ndarray
+    unsafe_inputs: np.ndarray
+    map_info: MapInfo
+    safety_radius: float
+    R_ref: np.ndarray | None = None
+    R_delta: np.ndarray | None = None
+
+
+@dataclass
+class BatchResults:
+    """
+    Closed-loop results of all scenarios in preallocated arrays, scenario index first.
+
+    Steps after a solver or simulator failure stay NaN, num_steps counts the completed steps.
+    """
+    x_sim: np.ndarray
+    u_sim: np.ndarray
+    num_steps: np.ndarray
+    duration: np.ndarray
+    metadata: dict = field(default_factory=dict)
+
+    @classmethod
+    def allocate(cls, num_scenarios: int, N_sim: int, nx: int, nu: int) -> 'BatchResults':
+        return cls(
+            x_sim=np.full((num_scenarios, N_sim + 1, nx), np.nan),
+            u_sim=np.full((num_scenarios, N_sim, nu), np.nan),
+            num_steps=np.zeros(num_scenarios, dtype=int),
+            duration=np.zeros(num_scenarios),
+        )
+
+    @property
+    def success(self) -> np.ndarray:
+        return self.num_steps == self.u_sim.shape[1]
+
+    def save(self, path: str):
+        """Stores every result array as its own column of a compressed .npz file."""
+        np.savez_compressed(
+            path, x_sim=self.x_sim, u_sim=self.u_sim, num_steps=self.num_steps, duration=self.duration,
+            **{f"meta_{key}": np.asarray(value) for key, value in self.metadata.items()}
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'BatchResults':
+        with np.load(path) as data:
+            # Scalars and strings are stored as 0-d arrays
+            metadata = {
+                key[len("meta_"):]: data[key].item() if data[key].ndim == 0 else data[key]
+                for key in data.files if key.startswith("meta_")
+            }
+            return cls(data["x_sim"], data["u_sim"], data["num_steps"], data["duration"], metadata)
+
+
+def scenario_sweep(
+        dt: float,
+        init_states: list[np.ndarray],
+        map_infos: list[MapInfo],
+        safety_radii: list[float],
+        weight_sets: list[tuple[np.ndarray, np.ndarray] | None] = (None,),
+) -> list[Scenario]:
+    """
+    Cartesian product of initial states, maps, safety radii and (R_ref, R_delta) weight sets.
+
+    The unsafe reference inputs are generated once per initial state and map.
+    """
+    unsafe_inputs = {
+        (i, j): np.vstack(generate_unsafe_trajectory(dt, x0, map_info)[0])
+        for (i, x0), (j, map_info) in itertools.product(enumerate(init_states), enumerate(map_infos))
+    }
+    scenarios = []
+    for (i, x0), (j, map_info), radius, weights in itertools.product(
+            enumerate(init_states), enumerate(map_infos), safety_radii, weight_sets
+    ):
+        R_ref, R_delta = weights if weights is not None else (None, None)
+        scenarios.append(Scenario(x0, unsafe_inputs[(i, j)], map_info, radius, R_ref, R_delta))
+    return scenarios
+
+
+# Solver instances of this process, created once per worker by _init_worker
+_worker_solvers: dict = {}
+
+
+def _create_solvers(
+        solver_kwargs: dict, sim_kwargs: dict | None, build: bool = True
+) -> tuple[AcadosOcpSolver, AcadosSimSolver | None]:
+    from .solver import create_solver, create_sim
+
+    ocp_solver = create_solver(**solver_kwargs, build=build)
+    sim_solver = create_sim(**sim_kwargs, build=build) if sim_kwargs is not None else None
+    return ocp_solver, sim_solver
+
+
+def _init_worker(solver_kwargs: dict, sim_kwargs: dict | None):
+    # The solver libraries were built by the parent process, the workers only load them
+    _worker_solvers["ocp"], _worker_solvers["sim"] = _create_solvers(solver_kwargs, sim_kwargs, build=False)
+
+
+def _set_weights(ocp_solver: AcadosOcpSolver, scenario: Scenario):
+    """Sets the scenario weights, scenarios without weights get the weights the solver was created with."""
+    cost = ocp_solver.acados_ocp.cost
+    N_horizon = ocp_solver.acados_ocp.solver_options.N_horizon
+    if scenario.R_ref is not None and scenario.R_delta is not None:
+        W_0, W = spl.block_diag(scenario.R_ref, scenario.R_delta), scenario.R_delta
+    else:
+        W_0, W = cost.W_0, cost.W
+    ocp_solver.cost_set(0, "W", W_0)
+    for k in range(1, N_horizon):
+        ocp_solver.cost_set(k, "W", W)
+
+
+def _simulate_chunk(
+        scenarios: list[Scenario],
+        N_sim: int,
+        obstacle_encoding: str,
+        ocp_solver: AcadosOcpSolver | None = None,
+        sim_solver: AcadosSimSolver | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    if ocp_solver is None:
+        ocp_solver, sim_solver = _worker_solvers["ocp"], _worker_solvers["sim"]
+    nx = ocp_solver.acados_ocp.dims.nx
+    nu = ocp_solver.acados_ocp.dims.nu
+
+    chunk = BatchResults.allocate(len(scenarios), N_sim, nx, nu)
+    for s, scenario in enumerate(scenarios):
+        start = time.perf_counter()
+        ocp_solver.reset()
+        _set_weights(ocp_solver, scenario)
+        _, u_traj, x_sim = simulate(
+            scenario.init_state,
+            scenario.unsafe_inputs,
+            scenario.map_info,
+            scenario.safety_radius,
+            ocp_solver=ocp_solver,
+            sim_solver=sim_solver,
+            N_sim=N_sim,
+            obstacle_encoding=obstacle_encoding,
+        )
+        chunk.x_sim[s] = x_sim
+        chunk.u_sim[s] = u_traj[:, 0]
+        chunk.num_steps[s] = np.count_nonzero(~np.isnan(x_sim[1:, 0]))
+        chunk.duration[s] = time.perf_counter() - start
+    return chunk.x_sim, chunk.u_sim, chunk.num_steps, chunk.duration
+
+
+def simulate_batch(
+        scenarios: list[Scenario],
+        solver_kwargs: dict,
+        sim_kwargs: dict | None = None,
+        N_sim: int = 100,
+        obstacle_encoding: str = "points",
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+) -> BatchResults:
+    """
+    Runs the closed-loop simulation of many scenarios on a process pool.
+
+    Parameters
+    ----------
+    solver_kwargs: dict
+        Keyword arguments of create_solver. The solver is built once in this process,
+        every worker loads the built library into its own AcadosOcpSolver.
+    sim_kwargs: dict, optional
+        Keyword arguments of create_sim, without a simulator the predicted next state is applied.
+    max_workers: int, optional
+        Number of worker processes, defaults to the number of CPUs. 1 runs in this process.
+    chunk_size: int, optional
+        Scenarios per task, defaults to an even split into four tasks per worker.
+    """
+    ocp_solver, sim_solver = _create_solvers(solver_kwargs, sim_kwargs)
+    nx = ocp_solver.acados_ocp.dims.nx
+    nu = ocp_solver.acados_ocp.dims.nu
+
+    results = BatchResults.allocate(len(scenarios), N_sim, nx, nu)
+    results.metadata = {"N_sim": N_sim, "obstacle_encoding": obstacle_encoding}
+    if not scenarios:
+        return results
+
+    workers = min(max_workers or os.cpu_count() or 1, len(scenarios))
+    chunk_size = chunk_size or max(1, -(-len(scenarios) // (4 * workers)))
+    chunks = [range(i, min(i + chunk_size, len(scenarios))) for i in range(0, len(scenarios), chunk_size)]
+
+    batch_logger.info(f"Simulating {len(scenarios)} scenarios in {len(chunks)} chunks on {workers} workers...")
+    start = time.perf_counter()
+    if workers <= 1:
+        outputs = (
+            _simulate_chunk([scenarios[i] for i in chunk], N_sim, obstacle_encoding, ocp_solver, sim_solver)
+            for chunk in chunks
+        )
+        for chunk, output in zip(chunks, outputs):
+            _store_chunk(results, chunk, output)
+    else:
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(solver_kwargs, sim_kwargs)
+        ) as executor:
+            futures = [
+                executor.submit(_simulate_chunk, [scenarios[i] for i in chunk], N_sim, obstacle_encoding)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                _store_chunk(results, chunk, future.result())
+
+    batch_logger.info(
+        f"Batch finished in {time.perf_counter() - start:.1f} s, "
+        f"{np.count_nonzero(results.success)} / {len(scenarios)} scenarios completed"
+    )
+    return results
+
+
+def _store_chunk(results: BatchResults, chunk: range, output: tuple):
+    rows = slice(chunk.start, chunk.stop)
+    results.x_sim[rows], results.u_sim[rows], results.num_steps[rows], results.duration[rows] = output
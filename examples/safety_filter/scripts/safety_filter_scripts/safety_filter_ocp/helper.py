@@ -1,20 +1,176 @@
 import numpy as np
 
+from scipy import ndimage
 from dataclasses import dataclass, field
 
 
+class ObstacleIndex:
+    """
+    Bucketed grid of the occupied cells for fast nearest-obstacle queries.
+
+    The occupied cells are stored per square bucket of `bucket_cells` x `bucket_cells` cells,
+    so a query only touches the buckets overlapping the local patch instead of the whole map.
+    Changed map regions are updated incrementally by rebuilding only the affected buckets.
+    """
+    def __init__(self, grid: np.ndarray, bucket_cells: int = 16):
+        self.bucket_cells = bucket_cells
+        self.shape = grid.shape
+        self.buckets: dict[tuple[int, int], np.ndarray] = {}
+
+        rows, cols = np.nonzero(grid == 1)
+        if rows.size == 0:
+            return
+        bucket_ids = (rows // bucket_cells) * self._num_bucket_cols + cols // bucket_cells
+        order = np.argsort(bucket_ids, kind='stable')
+        cells = np.column_stack((rows[order], cols[order]))
+        ids, starts = np.unique(bucket_ids[order], return_index=True)
+        for bucket_id, bucket_cells_ in zip(ids, np.split(cells, starts[1:])):
+            self.buckets[divmod(int(bucket_id), self._num_bucket_cols)] = bucket_cells_
+
+    @property
+    def _num_bucket_cols(self) -> int:
+        return -(-self.shape[1] // self.bucket_cells)
+
+    def update(self, grid: np.ndarray, row_start: int, row_end: int, col_start: int, col_end: int):
+        """Rebuilds the buckets overlapping the changed cell window [row_start:row_end, col_start:col_end]."""
+        b = self.bucket_cells
+        for br in range(row_start // b, -(-row_end // b)):
+            for bc in range(col_start // b, -(-col_end // b)):
+                r0, c0 = br * b, bc * b
+                rows, cols = np.nonzero(grid[r0:r0 + b, c0:c0 + b] == 1)
+                if rows.size:
+                    self.buckets[(br, bc)] = np.column_stack((rows + r0, cols + c0))
+                else:
+                    self.buckets.pop((br, bc), None)
+
+    def _window_cells(self, br: int, bc: int, row_start: int, row_end: int, col_start: int, col_end: int) -> np.ndarray | None:
+        """Occupied cells of one bucket inside the window, only border buckets are masked."""
+        cells = self.buckets.get((br, bc))
+        if cells is None:
+            return None
+        b = self.bucket_cells
+        if br * b >= row_start and (br + 1) * b <= row_end and bc * b >= col_start and (bc + 1) * b <= col_end:
+            return cells
+        inside = (
+            (cells[:, 0] >= row_start) & (cells[:, 0] < row_end) &
+            (cells[:, 1] >= col_start) & (cells[:, 1] < col_end)
+        )
+        return cells[inside]
+
+    def query(self, row_start: int, row_end: int, col_start: int, col_end: int) -> np.ndarray:
+        """Returns the (row, col) indices of all occupied cells in the window [row_start:row_end, col_start:col_end]."""
+        b = self.bucket_cells
+        candidates = [
+            self._window_cells(br, bc, row_start, row_end, col_start, col_end)
+            for br in range(row_start // b, -(-row_end // b))
+            for bc in range(col_start // b, -(-col_end // b))
+        ]
+        candidates = [c for c in candidates if c is not None and c.size]
+        if not candidates:
+            return np.empty((0, 2), dtype=int)
+        return np.concatenate(candidates)
+
+    def nearest(
+            self, center: np.ndarray, k: int,
+            row_start: int, row_end: int, col_start: int, col_end: int
+    ) -> np.ndarray:
+        """
+        Returns the (row, col) indices of the k occupied cells in the window closest to center, sorted by distance.
+
+        The buckets are searched in rings around the bucket of the center. The search stops as soon as
+        k cells are found and no cell of the next ring can be closer than the current k-th cell.
+
+        Parameters
+        ----------
+        center: np.ndarray
+            (row, col) position in continuous cell coordinates.
+        """
+        if k <= 0 or row_start >= row_end or col_start >= col_end:
+            return np.empty((0, 2), dtype=int)
+        b = self.bucket_cells
+        br_min, br_max = row_start // b, (row_end - 1) // b
+        bc_min, bc_max = col_start // b, (col_end - 1) // b
+        cbr = min(max(int(center[0]) // b, br_min), br_max)
+        cbc = min(max(int(center[1]) // b, bc_min), bc_max)
+        max_ring = max(cbr - br_min, br_max - cbr, cbc - bc_min, bc_max - cbc)
+        centers = np.asarray(center, dtype=float) - 0.5
+
+        found: list[np.ndarray] = []
+        num_found = 0
+        for ring in range(max_ring + 1):
+            for br in range(max(cbr - ring, br_min), min(cbr + ring, br_max) + 1):
+                on_edge = abs(br - cbr) == ring
+                bcs = range(max(cbc - ring, bc_min), min(cbc + ring, bc_max) + 1) if on_edge \
+                    else [bc for bc in (cbc - ring, cbc + ring) if bc_min <= bc <= bc_max]
+                for bc in bcs:
+                    cells = self._window_cells(br, bc, row_start, row_end, col_start, col_end)
+                    if cells is not None and cells.size:
+                        found.append(cells)
+                        num_found += cells.shape[0]
+
+            if num_found >= k and ring < max_ring:
+                cells = np.concatenate(found)
+                dist_sq = np.sum((cells - centers)**2, axis=1)
+                kth_dist_sq = np.partition(dist_sq, k - 1)[k - 1]
+                # Distance from the center to the border of the searched block of buckets
+                lower_bound = min(
+                    center[0] - (cbr - ring) * b, (cbr + ring + 1) * b - center[0],
+                    center[1] - (cbc - ring) * b, (cbc + ring + 1) * b - center[1],
+                )
+                if lower_bound > 0 and kth_dist_sq <= lower_bound**2:
+                    break
+
+        if not found:
+            return np.empty((0, 2), dtype=int)
+        cells = np.concatenate(found)
+        dist_sq = np.sum((cells - centers)**2, axis=1)
+        if k < len(dist_sq):
+            closest = np.argpartition(dist_sq, k - 1)[:k]
+        else:
+            closest = np.arange(len(dist_sq))
+        closest = closest[np.argsort(dist_sq[closest], kind='stable')]
+        return cells[closest]
+
+
 @dataclass
 class MapInfo:
     origin: np.ndarray
     grid: np.ndarray
     resolution: float
-    obstacle_positions: np.ndarray = field(init=False, repr=False)
+    obstacle_index: ObstacleIndex = field(init=False, repr=False)
+    _obstacle_positions: np.ndarray | None = field(init=False, repr=False, default=None)
+    _distance_field: np.ndarray | None = field(init=False, repr=False, default=None)
 
     def __post_init__(self):
-        rows, cols = np.where(self.grid == 1)
+        self.obstacle_index = ObstacleIndex(self.grid)
+
+    @property
+    def obstacle_positions(self) -> np.ndarray:
+        """World positions of all occupied cell centers, computed on first use and cached until the next update."""
+        if self._obstacle_positions is None:
+            rows, cols = np.where(self.grid == 1)
+            self._obstacle_positions = self.cell_centers(rows, cols)
+        return self._obstacle_positions
+
+    @property
+    def distance_field(self) -> np.ndarray:
+        """Signed distance field of the grid, computed on first use and cached until the next update."""
+        if self._distance_field is None:
+            self._distance_field = compute_signed_distance_field(self.grid, self.resolution)
+        return self._distance_field
+
+    def cell_centers(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
         obs_x = self.origin[0] + (cols + 0.5) * self.resolution
         obs_y = self.origin[1] + (rows + 0.5) * self.resolution
-        self.obstacle_positions = np.vstack((obs_x, obs_y)).T
+        return np.vstack((obs_x, obs_y)).T
+
+    def update(self, patch: np.ndarray, row_start: int = 0, col_start: int = 0):
+        """Writes a changed map patch into the grid and updates the obstacle index incrementally."""
+        row_end, col_end = row_start + patch.shape[0], col_start + patch.shape[1]
+        self.grid[row_start:row_end, col_start:col_end] = patch
+        self.obstacle_index.update(self.grid, row_start, row_end, col_start, col_end)
+        self._obstacle_positions = None
+        self._distance_field = None
 
     @property
     def height(self) -> int:
@@ -34,7 +190,7 @@ def get_relevant_obstacles(
     """
     Findet die k-nächsten Hindernis-Zellen zum Roboter.
     """
-    # --- Schritt 1 & 2: Kandidaten finden (optimiert und wie bisher) ---
+    # --- Schritt 1 & 2: Lokaler Patch um den Roboter ---
     robot_col = int((robot_position[0] - map_info.origin[0]) / map_info.resolution)
     robot_row = int((robot_position[1] - map_info.origin[1]) / map_info.resolution)
     
@@ -43,31 +199,129 @@ def get_relevant_obstacles(
     row_end = min(map_info.height, robot_row + patch_radius_cells)
     col_start = max(0, robot_col - patch_radius_cells)
     col_end = min(map_info.width, robot_col + patch_radius_cells)
-    
-    local_grid = map_info.grid[row_start:row_end, col_start:col_end]
-    
-    occupied_rows_local, occupied_cols_local = np.where(local_grid == 1)
-    if occupied_rows_local.size == 0:
+    # --- Schritt 3: KNN-Auswahl über den Obstacle-Index, nur die k nächsten werden sortiert ---
+    robot_cell = (np.asarray(robot_position)[1::-1] - np.asarray(map_info.origin)[::-1]) / map_info.resolution
+    cells = map_info.obstacle_index.nearest(
+        robot_cell, max_obstacles_to_return, row_start, row_end, col_start, col_end
+    )
+    return map_info.cell_centers(cells[:, 0], cells[:, 1])
+
+
+def cluster_obstacles(
+        map_info: MapInfo,
+        robot_position: np.ndarray,
+        local_patch_size_m: float,
+        max_obstacles_to_return: int,
+        cluster_cells: int = 4,
+) -> np.ndarray:
+    """
+    Fasst die Hindernis-Zellen im lokalen Patch zu wenigen Kreisen zusammen.
+
+    The occupied cells are split into 8-connected components. Only the boundary cells of a
+    component can be the closest obstacle cell, so the interior is dropped and the boundary is
+    covered by one circle per `cluster_cells` x `cluster_cells` tile of each component.
+    A wall therefore yields a few circles along its faces instead of one point per cell.
+    For a robot outside of all obstacles the distance to the closest circle border never
+    exceeds the distance to the closest occupied cell center.
+
+    Returns
+    -------
+    np.ndarray
+        (n, 3) array of [x, y, radius], the n <= max_obstacles_to_return circles with the smallest
+        distance between the robot and the circle border, sorted by that distance. The radius
+        covers the centers of all member cells, like the single cell points of get_relevant_obstacles.
+    """
+    robot_col = int((robot_position[0] - map_info.origin[0]) / map_info.resolution)
+    robot_row = int((robot_position[1] - map_info.origin[1]) / map_info.resolution)
+
+    patch_radius_cells = int(local_patch_size_m / 2 / map_info.resolution)
+    row_start = max(0, robot_row - patch_radius_cells)
+    row_end = min(map_info.height, robot_row + patch_radius_cells)
+    col_start = max(0, robot_col - patch_radius_cells)
+    col_end = min(map_info.width, robot_col + patch_radius_cells)
+    if max_obstacles_to_return <= 0 or row_start >= row_end or col_start >= col_end:
         return np.empty((0, 3))
 
-    occupied_cols_global = occupied_cols_local + col_start
-    occupied_rows_global = occupied_rows_local + row_start
-    
-    obstacle_candidates_x = map_info.origin[0] + (occupied_cols_global + 0.5) * map_info.resolution
-    obstacle_candidates_y = map_info.origin[1] + (occupied_rows_global + 0.5) * map_info.resolution
-    obstacle_candidates = np.vstack((obstacle_candidates_x, obstacle_candidates_y)).T
+    occupied = map_info.grid[row_start:row_end, col_start:col_end] == 1
+    labels, num_components = ndimage.label(occupied, structure=np.ones((3, 3), dtype=bool))
+    if num_components == 0:
+        return np.empty((0, 3))
+    boundary = occupied & ~ndimage.binary_erosion(occupied)
+    rows, cols = np.nonzero(boundary)
 
-    # --- Schritt 3: KNN-Auswahl (schnell und vektorisiert) ---
-    dist_sq = np.sum((obstacle_candidates - robot_position)**2, axis=1)
-    sorted_indices = np.argsort(dist_sq)
-    
-    # Wähle die 'max_obstacles_to_return' nächsten Indizes aus.
-    num_obstacles_to_select = min(max_obstacles_to_return, len(sorted_indices))
-    closest_indices = sorted_indices[:num_obstacles_to_select]
-    
-    final_obstacles = obstacle_candidates[closest_indices]
-    
-    return final_obstacles
+    # Ein Cluster pro (Komponente, Kachel)
+    keys = np.column_stack((labels[rows, cols], rows // cluster_cells, cols // cluster_cells))
+    _, cluster_ids = np.unique(keys, axis=0, return_inverse=True)
+    cluster_ids = cluster_ids.ravel()
+    num_clusters = cluster_ids.max() + 1
+
+    points = map_info.cell_centers(rows + row_start, cols + col_start)
+    counts = np.bincount(cluster_ids, minlength=num_clusters)
+    centers = np.column_stack((
+        np.bincount(cluster_ids, weights=points[:, 0], minlength=num_clusters),
+        np.bincount(cluster_ids, weights=points[:, 1], minlength=num_clusters),
+    )) / counts[:, None]
+    radii = np.zeros(num_clusters)
+    np.maximum.at(radii, cluster_ids, np.linalg.norm(points - centers[cluster_ids], axis=1))
+
+    clearance = np.linalg.norm(centers - np.asarray(robot_position)[:2], axis=1) - radii
+    k = min(max_obstacles_to_return, num_clusters)
+    closest = np.argpartition(clearance, k - 1)[:k] if k < num_clusters else np.arange(num_clusters)
+    closest = closest[np.argsort(clearance[closest], kind='stable')]
+    return np.column_stack((centers[closest], radii[closest]))
+
+
+def compute_signed_distance_field(grid: np.ndarray, resolution: float) -> np.ndarray:
+    """
+    Distance in meters from each cell center to the nearest occupied cell center.
+
+    Occupied cells get the negative distance to the nearest free cell center, so the field
+    stays informative inside obstacles. A grid without obstacles yields +inf everywhere.
+    """
+    occupied = grid == 1
+    if not occupied.any():
+        return np.full(grid.shape, np.inf)
+    dist_free = ndimage.distance_transform_edt(~occupied)
+    dist_occupied = ndimage.distance_transform_edt(occupied) if not occupied.all() else np.zeros(grid.shape)
+    return (dist_free - dist_occupied) * resolution
+
+
+def get_distance_patch(
+        map_info: MapInfo,
+        robot_position: np.ndarray,
+        num_cells: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Schneidet einen quadratischen Patch des Distanzfelds um den Roboter aus.
+
+    Parameters
+    ----------
+    num_cells: int
+        Edge length of the patch in cells, must match the patch size the solver was created with.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        World position [x, y] of the lower left patch corner and the num_cells**2 distance values,
+        flattened with x running fastest as expected by the CasADi interpolant.
+    """
+    robot_col = int((robot_position[0] - map_info.origin[0]) / map_info.resolution)
+    robot_row = int((robot_position[1] - map_info.origin[1]) / map_info.resolution)
+    row_start = robot_row - num_cells // 2
+    col_start = robot_col - num_cells // 2
+
+    # Cells outside of the map count as free and far away from any obstacle
+    far = num_cells * map_info.resolution
+    patch = np.full((num_cells, num_cells), far)
+    r0, r1 = max(0, row_start), min(map_info.height, row_start + num_cells)
+    c0, c1 = max(0, col_start), min(map_info.width, col_start + num_cells)
+    if r0 < r1 and c0 < c1:
+        patch[r0 - row_start:r1 - row_start, c0 - col_start:c1 - col_start] = np.minimum(
+            map_info.distance_field[r0:r1, c0:c1], far
+        )
+
+    patch_origin = np.asarray(map_info.origin, dtype=float) + np.array([col_start, row_start]) * map_info.resolution
+    return patch_origin, patch.ravel()
 
 
 def get_stage_ref(initial_state: np.ndarray, target_state: np.ndarray, target_input: np.ndarray): 
@@ -1,12 +1,70 @@
+from __future__ import annotations
+
 import logging
 import numpy as np
-from acados_template import AcadosOcpSolver, AcadosSimSolver
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from acados_template import AcadosOcpSolver, AcadosSimSolver
 
-from .helper import MapInfo, get_relevant_obstacles
+from .helper import MapInfo, get_relevant_obstacles, get_distance_patch, cluster_obstacles
 
 
 sim_logger = logging.getLogger("SF.SIMULATE")
 
+def get_obstacle_parameters(
+        ocp_solver: AcadosOcpSolver,
+        map_info: MapInfo,
+        robot_position: np.ndarray,
+        safety_radius: float,
+        obstacle_encoding: str = "points",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Parameter values and lower bounds of the obstacle constraints (lh) for the current robot position."""
+    dims = ocp_solver.acados_ocp.dims
+    if obstacle_encoding == "distance_field":
+        num_cells = int(np.sqrt(dims.np - 4))
+        patch_origin, distance_values = get_distance_patch(map_info, robot_position, num_cells)
+        p_values = np.concatenate(([0.2, 0.2], patch_origin, distance_values))
+        lh_values = np.full((dims.nh,), safety_radius)
+    elif obstacle_encoding == "circles":
+        num_obs = (dims.np - 2) // 3
+        circles = cluster_obstacles(
+            map_info=map_info,
+            robot_position=robot_position,
+            local_patch_size_m=50*map_info.resolution,
+            max_obstacles_to_return=num_obs
+        )
+        num_active_obstacles = len(circles)
+        p_values = np.zeros(dims.np)
+        p_values[:2] = [0.2, 0.2]
+        p_values[2:3*num_active_obstacles+2] = circles.flatten()
+
+        lh_active = np.full((num_active_obstacles * 2,), safety_radius)
+        lh_inactive = np.full((dims.nh - num_active_obstacles * 2,), -1e1)
+        lh_values = np.concatenate((lh_active, lh_inactive))
+    else:
+        num_obs = (dims.np - 2) // 2 
+        relevant_obstacles = get_relevant_obstacles(
+            map_info=map_info,
+            robot_position=robot_position,
+            local_patch_size_m=50*map_info.resolution,
+            max_obstacles_to_return=num_obs
+        )
+        num_active_obstacles = len(relevant_obstacles)
+        p_values = np.zeros(dims.np)
+        p_values[:2] = [0.2, 0.2]
+        if num_active_obstacles > 0:
+            obs_flat = relevant_obstacles.flatten()
+            p_values[2:len(obs_flat)+2] = obs_flat
+
+        # Setze den Safety Radius
+        lh_active = np.full((num_active_obstacles * 2,), safety_radius**2)
+        lh_inactive = np.full((dims.nh - num_active_obstacles * 2,), -1e1)
+        lh_values = np.concatenate((lh_active, lh_inactive))
+
+    return p_values, lh_values
+
+
 def simulate(
         init_state: np.ndarray,
         unsafe_inputs: np.ndarray, 
@@ -16,6 +74,7 @@ def simulate(
         sim_solver: AcadosSimSolver = None,
         N_sim: int = 1,
         print_statistics: bool = False,
+        obstacle_encoding: str = "points",
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     N_horizon = ocp_solver.acados_ocp.solver_options.N_horizon
     nx = ocp_solver.acados_ocp.model.x.shape[0]  # Number of states
@@ -26,6 +85,9 @@ def simulate(
     x_sim = np.full((N_sim + 1, nx), np.nan)
     x_current = init_state.copy()
     x_traj[0, 0] = init_state.copy()
+    x_sim[0] = init_state.copy()
+    debug = sim_logger.isEnabledFor(logging.DEBUG)
+    lh_written = None
 
     sim_logger.info("Starting simulation...")
     for i in range(N_sim):
@@ -40,30 +102,18 @@ def simulate(
                 np.zeros(ocp_solver.acados_ocp.dims.nu))))
         
         # set obstacles
-        num_obs = (ocp_solver.acados_ocp.dims.np - 2) // 2 
-        relevant_obstacles = get_relevant_obstacles(
-            map_info=map_info,
-            robot_position=x_current[:2],
-            local_patch_size_m=50*map_info.resolution,
-            max_obstacles_to_return=num_obs
+        p_values, lh_values = get_obstacle_parameters(
+            ocp_solver, map_info, x_current[:2], safety_radius, obstacle_encoding
         )
-        num_active_obstacles = len(relevant_obstacles)
-        p_values = np.zeros(ocp_solver.acados_ocp.dims.np)
-        p_values[:2] = [0.2, 0.2]
-        if num_active_obstacles > 0:
-            obs_flat = relevant_obstacles.flatten()
-            p_values[2:len(obs_flat)+2] = obs_flat
-
-        for k in range(N_horizon + 1):
-            ocp_solver.set(k, "p", p_values)
 
-        # Setze den Safety Radius
-        lh_active = np.full((num_active_obstacles * 2,), safety_radius**2)
-        lh_inactive = np.full((ocp_solver.acados_ocp.dims.nh - num_active_obstacles * 2,), -1e1)
-        lh_values = np.concatenate((lh_active, lh_inactive))
+        ocp_solver.set_flat("p", np.tile(p_values, N_horizon + 1))
 
-        for k in range(1, N_horizon):
-            ocp_solver.constraints_set(k, "lh", lh_values)
+        # acados has no flat setter for constraint bounds, the stages are only written if lh changed,
+        # i.e. if the number of active obstacles changed
+        if lh_written is None or not np.array_equal(lh_values, lh_written):
+            for k in range(1, N_horizon):
+                ocp_solver.constraints_set(k, "lh", lh_values)
+            lh_written = lh_values
 
         # Solve OCP
         status = ocp_solver.solve()
@@ -74,12 +124,8 @@ def simulate(
             break
         
         # Get states and inputs
-        for k in range(N_horizon + 1):
-            xk = ocp_solver.get(k, "x")
-            x_traj[i, k] = xk
-        for k in range(N_horizon):
-            uk = ocp_solver.get(k, "u")
-            u_traj[i, k] = uk
+        x_traj[i] = ocp_solver.get_flat("x").reshape(N_horizon + 1, nx)
+        u_traj[i] = ocp_solver.get_flat("u").reshape(N_horizon, nu)
 
         # Simulate
         if sim_solver is not None:
@@ -90,22 +136,23 @@ def simulate(
                 sim_logger.warning(f'Simulator failed with status {status_sim}')
                 break
             x_current = sim_solver.get('x')
-            x_sim[i + 1] = x_current.copy()
         else:
             x_current = x_traj[i, 1]
+        x_sim[i + 1] = x_current.copy()
 
         if i < (N_sim - 1):
             x_traj[i + 1, 0] = x_current.copy()
 
-        sim_logger.debug("States:")
-        for k, xk in enumerate(x_traj[i]):
-            value_strings = [f"{xkj:.3g}" for xkj in xk]
-            sim_logger.debug(f"Stage {k}: {value_strings}")
+        if debug:
+            sim_logger.debug("States:")
+            for k, xk in enumerate(x_traj[i]):
+                value_strings = [f"{xkj:.3g}" for xkj in xk]
+                sim_logger.debug(f"Stage {k}: {value_strings}")
 
-        sim_logger.debug("Inputs:")
-        for k, uk in enumerate(u_traj[i]):
-            value_strings = [f"{uk_j:.3g}" for uk_j in uk]
-            sim_logger.debug(f"Stage {k}: {value_strings}")
+            sim_logger.debug("Inputs:")
+            for k, uk in enumerate(u_traj[i]):
+                value_strings = [f"{uk_j:.3g}" for uk_j in uk]
+                sim_logger.debug(f"Stage {k}: {value_strings}")
 
     sim_logger.info("Simulation finished")
     return x_traj, u_traj, x_sim
@@ -84,6 +84,99 @@ def set_nonlinear_param_constraints(ocp: AcadosOcp, max_num_obs: int, r_unsafe_s
     ocp.cost.Zu = 1e3 * np.ones(ocp.dims.nsh)
 
 
+def set_circle_obstacle_constraints(ocp: AcadosOcp, max_num_obs: int, r_unsafe: float):
+    """
+    Obstacle constraints for clustered obstacles, each obstacle is a circle with its own radius.
+
+    h = distance to the circle border >= r_unsafe, for the front and rear point of the robot.
+    p = [d_front, d_rear, x_0, y_0, r_0, x_1, y_1, r_1, ...].
+    """
+    ocp.dims.np = max_num_obs * 3 + 2
+    ocp.dims.nh = max_num_obs * 2
+
+    ocp.dims.nsh = ocp.dims.nh
+    ocp.constraints.idxsh = np.arange(ocp.dims.nh)
+
+    p = ca.MX.sym('p', ocp.dims.np)
+    ocp.model.p = p
+
+    px, py, psi = ocp.model.x[0], ocp.model.x[1], ocp.model.x[2]
+    d_front, d_rear = p[0], p[1]
+
+    px_front = px + d_front * ca.cos(psi)
+    py_front = py + d_front * ca.sin(psi)
+    px_rear  = px - d_rear * ca.cos(psi)
+    py_rear  = py - d_rear * ca.sin(psi)
+
+    h_list = []
+    for i in range(max_num_obs):
+        xi, yi, ri = p[3*i + 2], p[3*i + 3], p[3*i + 4]
+        # kleiner Offset unter der Wurzel haelt den Gradienten im Kreismittelpunkt endlich
+        d_front_i = ca.sqrt((px_front - xi)**2 + (py_front - yi)**2 + 1e-6)
+        d_rear_i  = ca.sqrt((px_rear - xi)**2 + (py_rear - yi)**2 + 1e-6)
+        h_list.append(d_front_i - ri)
+        h_list.append(d_rear_i - ri)
+
+    ocp.model.con_h_expr = ca.vertcat(*h_list)
+
+    ocp.constraints.lh = np.full(ocp.dims.nh, r_unsafe)
+    ocp.constraints.uh = np.full(ocp.dims.nh, 1e4)
+
+    ocp.constraints.lsh = np.zeros(ocp.dims.nsh)
+    ocp.constraints.ush = 1e4 * np.ones(ocp.dims.nsh)
+
+    ocp.cost.zl = 1e3 * np.ones(ocp.dims.nsh)
+    ocp.cost.Zl = 1e3 * np.ones(ocp.dims.nsh)
+    ocp.cost.zu = 1e3 * np.ones(ocp.dims.nsh)
+    ocp.cost.Zu = 1e3 * np.ones(ocp.dims.nsh)
+
+
+def set_distance_field_constraints(ocp: AcadosOcp, num_cells: int, resolution: float, safety_radius: float):
+    """
+    Obstacle constraints on a local patch of the signed distance field.
+
+    The patch values are parameters of a CasADi interpolant, so the constraint count stays at two
+    (front and rear point) independent of the number of obstacles and a changed map only changes
+    the parameter values, not the generated code.
+    p = [d_front, d_rear, patch_origin_x, patch_origin_y, num_cells**2 distance values].
+    """
+    ocp.dims.np = 4 + num_cells**2
+    ocp.dims.nh = 2
+
+    ocp.dims.nsh = ocp.dims.nh
+    ocp.constraints.idxsh = np.arange(ocp.dims.nh)
+
+    p = ca.MX.sym('p', ocp.dims.np)
+    ocp.model.p = p
+
+    px, py, psi = ocp.model.x[0], ocp.model.x[1], ocp.model.x[2]
+    d_front, d_rear = p[0], p[1]
+    patch_origin = p[2:4]
+    distance_values = p[4:]
+
+    # Stützstellen in den Zellmittelpunkten, relativ zum Patch-Ursprung
+    axis = list((np.arange(num_cells) + 0.5) * resolution)
+    distance_field = ca.interpolant('distance_field', 'linear', [axis, axis], 1)
+
+    front = ca.vertcat(px + d_front * ca.cos(psi), py + d_front * ca.sin(psi))
+    rear  = ca.vertcat(px - d_rear * ca.cos(psi), py - d_rear * ca.sin(psi))
+
+    ocp.model.con_h_expr = ca.vertcat(
+        distance_field(front - patch_origin, distance_values),
+        distance_field(rear - patch_origin, distance_values),
+    )
+
+    ocp.constraints.lh = np.full(ocp.dims.nh, safety_radius)
+    ocp.constraints.uh = np.full(ocp.dims.nh, 1e4)
+
+    ocp.constraints.lsh = np.zeros(ocp.dims.nsh)
+    ocp.constraints.ush = 1e4 * np.ones(ocp.dims.nsh)
+
+    ocp.cost.zl = 1e3 * np.ones(ocp.dims.nsh)
+    ocp.cost.Zl = 1e3 * np.ones(ocp.dims.nsh)
+    ocp.cost.zu = 1e3 * np.ones(ocp.dims.nsh)
+    ocp.cost.Zu = 1e3 * np.ones(ocp.dims.nsh)
+
 
 def create_solver(
         N_horizon: int,
@@ -92,10 +185,28 @@ def create_solver(
         r_unsafe_square: float, 
         R_ref: np.ndarray = None,
         R_delta: np.ndarray = None,
-        gen_code_path: str = ""
+        gen_code_path: str = "",
+        obstacle_encoding: str = "points",
+        distance_field_cells: int = 50,
+        distance_field_resolution: float = 0.1,
+        build: bool = True,
 ):
     """
     Erstellt und konfiguriert den AcadosOcpSolver.
+
+    Parameters
+    ----------
+    obstacle_encoding: str
+        "points" constrains the distance to the max_num_obs nearest obstacle cells,
+        "circles" to the max_num_obs nearest clustered obstacle circles (see cluster_obstacles),
+        "distance_field" interpolates a parameterized local patch of the signed distance field.
+    distance_field_cells: int
+        Edge length in cells of the distance field patch, only used with "distance_field".
+    distance_field_resolution: float
+        Cell size of the distance field patch in meters, should match the map resolution.
+    build: bool
+        Generate and compile the solver. False loads the already built solver library,
+        e.g. in worker processes of a batch simulation.
     """
     ocp = AcadosOcp()
     ocp.model = get_skid_steer_model(dt)
@@ -158,7 +269,14 @@ def create_solver(
     ocp.constraints.ubx = np.array([v_max, omega_max])
     ocp.constraints.idxbx = np.array([3, 4])
 
-    set_nonlinear_param_constraints(ocp, max_num_obs, r_unsafe_square)
+    if obstacle_encoding == "points":
+        set_nonlinear_param_constraints(ocp, max_num_obs, r_unsafe_square)
+    elif obstacle_encoding == "circles":
+        set_circle_obstacle_constraints(ocp, max_num_obs, np.sqrt(r_unsafe_square))
+    elif obstacle_encoding == "distance_field":
+        set_distance_field_constraints(ocp, distance_field_cells, distance_field_resolution, np.sqrt(r_unsafe_square))
+    else:
+        raise ValueError(f"Unknown obstacle encoding '{obstacle_encoding}', expected 'points', 'circles' or 'distance_field'.")
 
     # --- Parameter ---
     # Anfangszustand
@@ -183,7 +301,7 @@ def create_solver(
     cm_builder.options_on = ['BUILD_ACADOS_OCP_SOLVER_LIB']
 
     json_file = os.path.join(os.path.dirname(__file__) if not gen_code_path else gen_code_path, 'safety_filter_ocp.json')
-    if os.path.exists(json_file):
+    if build and os.path.exists(json_file):
         os.remove(json_file)
 
     # --- ROS Options ---
@@ -192,14 +310,15 @@ def create_solver(
     ocp.ros_opts.namespace = "safety_filter"
     ocp.ros_opts.package_name = "safety_filter_mpc"
 
-    solver = AcadosOcpSolver(ocp, json_file=json_file, cmake_builder=cm_builder)
+    solver = AcadosOcpSolver(ocp, json_file=json_file, cmake_builder=cm_builder, generate=build, build=build)
 
     return solver
 
 
 def create_sim(
         dt: float,
-        gen_code_path: str = ""
+        gen_code_path: str = "",
+        build: bool = True,
 ):
     sim = AcadosSim()
     sim.model = get_skid_steer_model(dt)
@@ -209,8 +328,8 @@ def create_sim(
     sim.solver_options.num_steps = 1
 
     json_file = os.path.join(os.path.dirname(__file__) if not gen_code_path else gen_code_path, 'skid_steer_sim.json')
-    if os.path.exists(json_file):
+    if build and os.path.exists(json_file):
         os.remove(json_file)
 
-    acados_simulator = AcadosSimSolver(sim, json_file=json_file)
+    acados_simulator = AcadosSimSolver(sim, json_file=json_file, generate=build, build=build)
     return acados_simulator
\ No newline at end of file
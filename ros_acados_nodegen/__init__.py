@@ -2,12 +2,23 @@ import logging
 from .utils.logger import setup_logging
 setup_logging(logging.WARNING)
 
-from .generator import generate_ros_package
-
 __all__ = [
-    'generate_ros_package'
+    'generate_ros_package',
+    'generate_ros_packages'
 ]
 
 __annotations__ = {
-    'generate_ros_package': 'function'
-}
\ No newline at end of file
+    'generate_ros_package': 'function',
+    'generate_ros_packages': 'function'
+}
+
+
+def __getattr__(name):
+    # Lazy imports, the CLIs and acados-install don't need pydantic, yaml and jinja at startup
+    if name == 'generate_ros_package':
+        from .generator import generate_ros_package
+        return generate_ros_package
+    if name == 'generate_ros_packages':
+        from .batch import generate_ros_packages
+        return generate_ros_packages
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
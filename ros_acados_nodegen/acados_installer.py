@@ -1,10 +1,22 @@
 import argparse
+import hashlib
+import json
 import os
+import platform
+import shutil
 import sys
 import subprocess
+import tarfile
+import tempfile
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 ACADOS_REPO = "https://github.com/acados/acados.git"
+GITHUB_URL = "https://github.com/"
+DEFAULT_CACHE_DIR = Path(os.environ.get("ACADOS_ARTIFACT_CACHE", Path.home() / ".cache" / "ros_acados_nodegen" / "acados"))
+# Parts of the install tree (CMAKE_INSTALL_PREFIX is the acados directory), which are stored in the artifact cache
+INSTALL_TREE = ("lib", "include", "bin")
+HW_BENCHMARK_SOURCE = Path(__file__).resolve().parent / "harness" / "acados_hw_benchmark.c"
 
 def run(cmd, cwd=None, check=True):
     print(f"==> {cmd}")
@@ -13,6 +25,14 @@ def run(cmd, cwd=None, check=True):
 def check_cmd(name):
     return subprocess.call(["which", name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
 
+def git(args: List[str], cwd=None, mirror: Optional[Path] = None):
+    """Runs git, with a mirror all GitHub URLs (also of the submodules) are redirected to <mirror>/<owner>/<repo>.git."""
+    cmd = ["git"]
+    if mirror:
+        # Submodules may only be cloned from file URLs if explicitly allowed
+        cmd += ["-c", f"url.{mirror.resolve().as_uri()}/.insteadOf={GITHUB_URL}", "-c", "protocol.file.allow=always"]
+    run(cmd + args, cwd=cwd)
+
 def write_exports(acados_dir: Path, rc_file: Path):
     lines = [
         "",
@@ -23,44 +43,213 @@ def write_exports(acados_dir: Path, rc_file: Path):
     with rc_file.open("a", encoding="utf-8") as f:
         f.write("\n".join(lines) + "\n")
     print(f"Appended ACADOS env to {rc_file}. Source it or open a new shell.")
-    
+
 def check_exports(rc_file: Path):
     return rc_file.exists() and any("ACADOS_SOURCE_DIR" in line for line in rc_file.read_text().splitlines())
 
-def install_acados(prefix: Path, with_openmp: bool, with_osqp: bool, 
-                   with_qpoases: bool, export_env: bool):
+def fetch_sources(acados_dir: Path, ref: Optional[str], mirror: Optional[Path], shallow: bool, jobs: int):
+    """
+    Clones acados (or checks out ref in an existing clone) and updates the submodules.
+
+    Shallow fetches only load the checked out commit, the submodules are fetched in parallel.
+    """
+    depth = ["--depth", "1"] if shallow else []
+    if not acados_dir.exists():
+        print(f"Cloning acados into {acados_dir} ...")
+        acados_dir.mkdir(parents=True)
+        git(["init", "-q"], cwd=acados_dir)
+        git(["remote", "add", "origin", ACADOS_REPO], cwd=acados_dir)
+        # Fetching a single ref works for branches, tags and commits
+        git(["fetch", *depth, "origin", ref or "HEAD"], cwd=acados_dir, mirror=mirror)
+        git(["checkout", "-q", "--detach", "FETCH_HEAD"], cwd=acados_dir)
+    elif ref:
+        print(f"Checking out {ref} in {acados_dir} ...")
+        git(["fetch", *depth, "origin", ref], cwd=acados_dir, mirror=mirror)
+        git(["checkout", "-q", "--detach", "FETCH_HEAD"], cwd=acados_dir)
+    else:
+        print(f"acados directory already exists: {acados_dir}")
+    git(["submodule", "update", "--init", "--recursive", *depth, "--jobs", str(jobs)], cwd=acados_dir, mirror=mirror)
+
+def cpu_features() -> set:
+    """Flags (x86) or Features (ARM) of /proc/cpuinfo, empty if not available."""
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text()
+    except OSError:
+        return set()
+    features = set()
+    for line in cpuinfo.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() in ("flags", "Features"):
+            features.update(value.split())
+        elif key.strip() == "CPU part":
+            features.add(f"part_{value.strip()}")
+    return features
+
+def detect_targets() -> Tuple[str, str]:
+    """BLASFEO_TARGET and HPIPM_TARGET matching the CPU of this machine."""
+    machine = platform.machine().lower()
+    features = cpu_features()
+    if machine in ("x86_64", "amd64"):
+        if "avx512f" in features:
+            return "X64_INTEL_SKYLAKE_X", "AVX512"
+        if {"avx2", "fma"} <= features:
+            return "X64_INTEL_HASWELL", "AVX"
+        if "avx" in features:
+            return "X64_INTEL_SANDY_BRIDGE", "AVX"
+        if "pni" in features or "sse3" in features:
+            return "X64_INTEL_CORE", "GENERIC"
+    elif machine in ("aarch64", "arm64"):
+        if platform.system() == "Darwin":
+            return "ARMV8A_APPLE_M1", "GENERIC"
+        # Only pure Cortex-A53 (part 0xd03) systems get the in-order kernels
+        parts = {f for f in features if f.startswith("part_")}
+        if parts == {"part_0xd03"}:
+            return "ARMV8A_ARM_CORTEX_A53", "GENERIC"
+        return "ARMV8A_ARM_CORTEX_A57", "GENERIC"
+    elif machine.startswith("armv7") and {"neon", "vfpv4"} <= features:
+        return "ARMV7A_ARM_CORTEX_A15", "GENERIC"
+    return "GENERIC", "GENERIC"
+
+def artifact_key(acados_dir: Path, cmake_flags: List[str]) -> str:
+    """Hash of the acados commit, the CMake flags, the compiler and the architecture."""
+    commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=acados_dir, text=True).strip()
+    compiler = "unknown"
+    if check_cmd("cc"):
+        compiler = subprocess.check_output(["cc", "--version"], text=True).splitlines()[0]
+    payload = "\n".join([commit, platform.machine(), compiler, *sorted(cmake_flags)])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def restore_artifact(archive: Path, acados_dir: Path) -> bool:
+    if not archive.is_file():
+        return False
+    print(f"Restoring acados build from {archive} ...")
+    with tarfile.open(archive, "r:gz") as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(acados_dir, filter="data")
+        else:
+            tar.extractall(acados_dir)
+    return True
+
+def store_artifact(archive: Path, acados_dir: Path):
+    # Written to a temporary file and renamed, so concurrent installs never read a partial archive
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=archive.parent, prefix=".tmp-", suffix=".tar.gz")
+    os.close(fd)
+    try:
+        with tarfile.open(tmp, "w:gz") as tar:
+            for name in INSTALL_TREE:
+                if (acados_dir / name).exists():
+                    tar.add(acados_dir / name, arcname=name)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, archive)
+        print(f"Stored acados build in {archive}")
+    except OSError as e:
+        Path(tmp).unlink(missing_ok=True)
+        print(f"WARNING: Could not store acados build in the cache: {e}", file=sys.stderr)
+
+def build_acados(acados_dir: Path, cmake_flags: List[str], jobs: int, use_ccache: bool):
+    """Configures and builds incrementally, an existing build directory is reused."""
+    build_dir = acados_dir / "build"
+    generator = "Ninja" if check_cmd("ninja") else "Unix Makefiles"
+    cache = build_dir / "CMakeCache.txt"
+    if cache.exists() and f"CMAKE_GENERATOR:INTERNAL={generator}" not in cache.read_text():
+        print(f"Build directory was configured with another generator, reconfiguring with {generator} ...")
+        shutil.rmtree(build_dir)
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    launcher = []
+    if use_ccache and check_cmd("ccache"):
+        launcher = ["-DCMAKE_C_COMPILER_LAUNCHER=ccache", "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache"]
+    print(f"Configuring with CMake ({generator}) ...")
+    run(["cmake", "-G", generator, *cmake_flags, *launcher, ".."], cwd=build_dir)
+    print(f"Building and installing acados (-j{jobs}) ...")
+    run(["cmake", "--build", ".", "--target", "install", "--parallel", str(jobs)], cwd=build_dir)
+
+def run_benchmark(acados_dir: Path, repetitions: int = 1000) -> Optional[dict]:
+    """
+    Compiles and runs the BLASFEO/HPIPM micro-benchmark against the installed libraries.
+
+    Returns
+    -------
+    dict
+        GFLOPs of dgemm_nt and dpotrf_l per matrix size and the dense QP solve time, None if the benchmark failed.
+    """
+    cc = os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+    if not cc:
+        print("WARNING: No C compiler found, skipping the benchmark.", file=sys.stderr)
+        return None
+    include_dir = acados_dir / "include"
+    lib_dir = acados_dir / "lib"
+    with tempfile.TemporaryDirectory(prefix="acados_hw_benchmark_") as tmp:
+        executable = Path(tmp) / "acados_hw_benchmark"
+        cmd = [
+            cc, "-O2", str(HW_BENCHMARK_SOURCE), "-o", str(executable),
+            f"-I{include_dir / 'blasfeo' / 'include'}",
+            f"-I{include_dir / 'hpipm' / 'include'}",
+            f"-L{lib_dir}", "-lhpipm", "-lblasfeo", "-lm",
+            f"-Wl,-rpath,{lib_dir}",
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            output = subprocess.run([str(executable), str(repetitions)], check=True, capture_output=True, text=True).stdout
+        except subprocess.CalledProcessError as e:
+            print(f"WARNING: acados benchmark failed: {e.stderr.strip()}", file=sys.stderr)
+            return None
+    result = json.loads(output)
+
+    print("acados micro-benchmark:")
+    for size, gflops in result["gemm"].items():
+        print(f"  n={size:>4}  dgemm_nt {gflops:7.2f} GFLOPs  dpotrf_l {result['potrf'][size]:7.2f} GFLOPs")
+    qp = result["qp"]
+    print(f"  dense QP (nv={qp['nv']}, box constraints): {qp['solve_us']:.1f} us, {qp['iterations']} iterations, status {qp['status']}")
+    return result
+
+def install_acados(prefix: Path, with_openmp: bool, with_osqp: bool,
+                   with_qpoases: bool, export_env: bool, ref: Optional[str] = None,
+                   mirror: Optional[Path] = None, shallow: bool = True,
+                   cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, use_ccache: bool = True,
+                   blasfeo_target: str = "auto", hpipm_target: str = "auto",
+                   build_type: str = "Release", benchmark: bool = True):
     # Basic checks
-    for dep in ["git", "cmake", "make"]:
+    for dep in ["git", "cmake"]:
         if not check_cmd(dep):
             print(f"ERROR: '{dep}' not found. Please install it first.", file=sys.stderr)
             sys.exit(1)
+    if not (check_cmd("make") or check_cmd("ninja")):
+        print("ERROR: Neither 'make' nor 'ninja' found. Please install one of them first.", file=sys.stderr)
+        sys.exit(1)
 
     # --- Load acados modules ---
     acados_dir = prefix
-    build_dir = acados_dir / "build"
     acados_dir.parent.mkdir(parents=True, exist_ok=True)
-    if not acados_dir.exists():
-        print(f"Cloning acados into {acados_dir} ...")
-        run(["git", "clone", ACADOS_REPO, str(acados_dir)])
-        run(["git", "submodule", "update", "--init", "--recursive"], cwd=acados_dir)
-    else:
-        print(f"acados directory already exists: {acados_dir}")
+    jobs = os.cpu_count() or 2
+    fetch_sources(acados_dir, ref, mirror, shallow, jobs)
 
     # --- Build acados ---
-    build_dir.mkdir(parents=True, exist_ok=True)
+    detected_blasfeo, detected_hpipm = detect_targets()
+    blasfeo_target = detected_blasfeo if blasfeo_target == "auto" else blasfeo_target
+    hpipm_target = detected_hpipm if hpipm_target == "auto" else hpipm_target
+    print(f"Building for BLASFEO_TARGET={blasfeo_target}, HPIPM_TARGET={hpipm_target} ({build_type})")
     cmake_flags = [
+        f"-DCMAKE_BUILD_TYPE={build_type}",
+        f"-DBLASFEO_TARGET={blasfeo_target}",
+        f"-DHPIPM_TARGET={hpipm_target}",
         f"-DACADOS_WITH_OPENMP={'ON' if with_openmp else 'OFF'}",
         f"-DACADOS_WITH_OSQP={'ON' if with_osqp else 'OFF'}",
         f"-DACADOS_WITH_QPOASES={'ON' if with_qpoases else 'OFF'}",
         f"-DACADOS_PYTHON='ON'",
     ]
-    jobs = os.cpu_count() or 2
-    if not build_dir.exists():
-        print("Configuring with CMake ...")
-        run(["cmake", "..", *cmake_flags], cwd=build_dir)
-        print(f"Building and installing acados (-j{jobs}) ...")
-        run(["make", f"-j{jobs}"], cwd=build_dir)
-        run(["make", "install"], cwd=build_dir)
+    archive = None
+    if cache_dir:
+        archive = Path(cache_dir) / f"acados-{artifact_key(acados_dir, cmake_flags)}.tar.gz"
+    if archive and restore_artifact(archive, acados_dir):
+        print("Skipping the build, the cached build matches commit and flags.")
+    else:
+        build_acados(acados_dir, cmake_flags, jobs, use_ccache)
+        if archive:
+            store_artifact(archive, acados_dir)
+    if benchmark:
+        run_benchmark(acados_dir)
 
     # --- Install acados template in pip ---
     python = Path(sys.executable)
@@ -85,6 +274,18 @@ def main():
     p.add_argument("--osqp", action="store_true", help="Enable OSQP")
     p.add_argument("--qpoases", action="store_true", help="Enable qpOASES")
     p.add_argument("-e", "--export", action="store_true", help="Append ACADOS env to your shell rc file")
+    p.add_argument("--ref", help="acados branch, tag or commit to check out (default: the default branch)")
+    p.add_argument("--mirror", type=Path, help="Local mirror with bare repos as <owner>/<repo>.git, used instead of GitHub")
+    p.add_argument("--full-clone", action="store_true", help="Fetch the full history instead of shallow clones")
+    p.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                   help=f"Artifact cache of prebuilt install trees (default: $ACADOS_ARTIFACT_CACHE or {DEFAULT_CACHE_DIR})")
+    p.add_argument("--no-cache", action="store_true", help="Neither read nor write the artifact cache")
+    p.add_argument("--no-ccache", action="store_true", help="Do not use ccache, even if it is installed")
+    p.add_argument("--blasfeo-target", default="auto",
+                   help="BLASFEO_TARGET, e.g. X64_INTEL_HASWELL or ARMV8A_ARM_CORTEX_A57 (default: detected from the CPU)")
+    p.add_argument("--hpipm-target", default="auto", help="HPIPM_TARGET: AVX512, AVX or GENERIC (default: detected from the CPU)")
+    p.add_argument("--build-type", default="Release", choices=["Release", "RelWithDebInfo", "Debug"], help="CMake build type (default: Release)")
+    p.add_argument("--no-benchmark", action="store_true", help="Skip the BLASFEO/HPIPM micro-benchmark after the installation")
     args = p.parse_args()
 
     install_acados(
@@ -92,8 +293,17 @@ def main():
         with_openmp=args.omp,
         with_osqp=args.osqp,
         with_qpoases=args.qpoases,
-        export_env=args.export
+        export_env=args.export,
+        ref=args.ref,
+        mirror=args.mirror,
+        shallow=not args.full_clone,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        use_ccache=not args.no_ccache,
+        blasfeo_target=args.blasfeo_target,
+        hpipm_target=args.hpipm_target,
+        build_type=args.build_type,
+        benchmark=not args.no_benchmark,
     )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import yaml
+import logging
+import traceback
+from typing import Any
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pydantic import BaseModel, Field
+
+from .generator import generate_ros_package
+from .context.pkg_context import PackageContext
+from .utils.context_utils import parse_dot_key_value
+from .renderer.package_generator import get_jinja_env
+
+logger = logging.getLogger(__name__)
+
+
+class BatchEntry(BaseModel):
+    """One package of a batch manifest."""
+    solver_path: Path
+    config_path: Path | None = None
+    install_path: Path | None = None
+    overrides: dict[str, Any] = Field(default_factory=dict)
+
+    def package_name(self) -> str | None:
+        """Package name after the overrides, without loading the solver JSON. None if the config is unreadable."""
+        package = parse_dot_key_value(self.overrides).get("package")
+        if isinstance(package, dict) and "name" in package:
+            return str(package["name"])
+        if self.config_path:
+            try:
+                with open(self.config_path, 'r') as f:
+                    config = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError):
+                return None
+            name = (config.get("package") or {}).get("name")
+            if name:
+                return str(name)
+        return PackageContext.model_fields["name"].default
+
+
+class BatchManifest(BaseModel):
+    install_path: Path | None = None
+    packages: list[BatchEntry] = Field(default_factory=list)
+
+    @classmethod
+    def from_yaml(cls, manifest_path: str | Path) -> 'BatchManifest':
+        """Loads the manifest, relative paths are resolved against the manifest directory."""
+        manifest_path = Path(manifest_path)
+        with open(manifest_path, 'r') as f:
+            manifest = cls.model_validate(yaml.safe_load(f) or {})
+
+        base = manifest_path.resolve().parent
+
+        def resolve(p: Path | None) -> Path | None:
+            return p if p is None or p.is_absolute() else base / p
+
+        manifest.install_path = resolve(manifest.install_path)
+        for entry in manifest.packages:
+            entry.solver_path = resolve(entry.solver_path)
+            entry.config_path = resolve(entry.config_path)
+            entry.install_path = resolve(entry.install_path) or manifest.install_path
+        return manifest
+
+    def check_unique_packages(self) -> None:
+        """
+        Raises a ValueError if entries resolve to the same package path,
+        their workers would write the same directory concurrently.
+        Equal names are fine as long as the install paths differ.
+        """
+        seen: dict[Path, int] = {}
+        duplicates = []
+        for index, entry in enumerate(self.packages):
+            name = entry.package_name()
+            if name is None:
+                continue
+            path = ((entry.install_path or Path.cwd()) / name).resolve()
+            first = seen.setdefault(path, index)
+            if first != index:
+                duplicates.append(f"packages[{index}] and packages[{first}] both generate '{name}' ({path})")
+        if duplicates:
+            raise ValueError("Duplicate packages in the batch manifest:\n  " + "\n  ".join(duplicates))
+
+
+class BatchResult(BaseModel):
+    solver_path: Path
+    package_path: Path | None = None
+    success: bool = False
+    duration: float = 0.0
+    error: str = ""
+
+
+def _init_worker():
+    # Compile the templates once per worker, all packages of this worker share the environment
+    get_jinja_env()
+
+
+def _generate_entry(entry: BatchEntry, force: bool) -> BatchResult:
+    start = time.perf_counter()
+    result = BatchResult(solver_path=entry.solver_path)
+    try:
+        result.package_path = generate_ros_package(
+            entry.solver_path,
+            install_path=entry.install_path,
+            config_path=entry.config_path,
+            force=force,
+            **entry.overrides
+        )
+        result.success = True
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        logger.debug(traceback.format_exc())
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def generate_ros_packages(manifest_path, max_workers=None, force=False) -> list[BatchResult]:
+    """
+    Generate all ROS packages of a batch manifest in parallel.
+
+    Parameters
+    ----------
+    manifest_path : str
+        Path to the YAML manifest with an optional default `install_path` and a list of `packages`,
+        each with `solver_path`, `config_path`, `install_path` and dot-key `overrides`.
+    max_workers : int, optional
+        Number of worker processes, defaults to the number of CPUs.
+    force : bool, optional
+        Regenerate all files, even if the generation manifests report unchanged inputs.
+
+    Returns
+    -------
+    list[BatchResult]
+        One result per package, in manifest order.
+
+    Raises
+    ------
+    ValueError
+        If two packages resolve to the same package path.
+    """
+    manifest = BatchManifest.from_yaml(manifest_path)
+    if not manifest.packages:
+        logger.warning(f"No packages listed in '{manifest_path}'.")
+        return []
+    manifest.check_unique_packages()
+
+    workers = min(max_workers or os.cpu_count() or 1, len(manifest.packages))
+    if workers <= 1:
+        _init_worker()
+        return [_generate_entry(entry, force) for entry in manifest.packages]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(_generate_entry, entry, force) for entry in manifest.packages]
+        return [future.result() for future in futures]
+
+
+def format_report(results: list[BatchResult]) -> str:
+    """Summary table with the timing and errors of each package."""
+    lines = [f"{'Package':<40} {'Status':<8} {'Time [s]':>9}"]
+    for r in results:
+        name = r.package_path.name if r.package_path else r.solver_path.name
+        lines.append(f"{name:<40} {'OK' if r.success else 'FAILED':<8} {r.duration:>9.3f}")
+        if r.error:
+            lines.append(f"    {r.error}")
+    failed = sum(not r.success for r in results)
+    lines.append(f"{len(results) - failed} generated, {failed} failed, {sum(r.duration for r in results):.3f} s cumulative")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Generate many ROS packages from a batch manifest.")
+    parser.add_argument("manifest_path", type=Path, help="Path to the YAML batch manifest.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--force", action="store_true", help="Regenerate all files, even if the inputs did not change.")
+    parser.add_argument("--report", type=Path, default=None, help="Write the results as JSON to this path.")
+    args = parser.parse_args()
+
+    results = generate_ros_packages(args.manifest_path, max_workers=args.jobs, force=args.force)
+    print(format_report(results))
+    if args.report:
+        args.report.write_text(json.dumps([r.model_dump(mode="json") for r in results], indent=2))
+    sys.exit(0 if all(r.success for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
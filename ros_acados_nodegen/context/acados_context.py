@@ -1,6 +1,7 @@
 import json
 import logging
 from pathlib import Path
+from typing import Literal
 from pydantic import BaseModel, Field, model_validator
 
 logger = logging.getLogger(__name__)
@@ -20,7 +21,7 @@ def get_diagonal(matrix: list) -> list[float]:
 class ValueContext(BaseModel):
     name: str = "acados_name"
     log_label: str = "This Value"
-    value: list[float] = Field(default=list)
+    value: list[float] = Field(default_factory=list)
     
     @property
     def non_empty(self) -> bool:
@@ -66,7 +67,16 @@ class AcadosSolverOptionsContext(BaseModel):
     nlp_solver_type: str = "SQP_RTI"
     warmstart_first: bool = True
     warmstart: bool = False
+    warmstart_mode: Literal["states", "shift"] = "states"
+    shift_reset_threshold: float = 1.0
     Tsim: float = 0.1
+    max_iter: int = 100
+
+class AcadosFormulationContext(BaseModel):
+    cost_type_0: str = "LINEAR_LS"
+    cost_type: str = "LINEAR_LS"
+    cost_type_e: str = "LINEAR_LS"
+    constr_type_0: str = "BGH"
 
 class AcadosConstraintsContext(_BaseFlagged):
     # States Bounds
@@ -204,6 +214,7 @@ class AcadosReferencesContext(_BaseFlagged):
 class AcadosContext(BaseModel):
     model: AcadosModelContext = Field(default=AcadosModelContext)
     solver: AcadosSolverOptionsContext = Field(default=AcadosSolverOptionsContext)
+    formulation: AcadosFormulationContext = Field(default=AcadosFormulationContext)
     constraints: AcadosConstraintsContext = Field(default=AcadosConstraintsContext)
     weights: AcadosWeightsContext = Field(default=AcadosWeightsContext)
     slacks: AcadosSlackContext = Field(default=AcadosSlackContext)
@@ -236,6 +247,9 @@ class AcadosContext(BaseModel):
 
 
         solver_options = data.get("solver", {})
+        # SQP iteration limit of the exported solver, the deadline mode never allows more
+        if "nlp_solver_max_iter" in data.get("solver_options", {}):
+            solver_options = {**solver_options, "max_iter": data["solver_options"]["nlp_solver_max_iter"]}
         model_options = data.get("model", {})
         constraints_options = data.get("constraints", {})
         cost_options = data.get("cost", {})
@@ -264,6 +278,9 @@ class AcadosContext(BaseModel):
         return cls(
             model=AcadosModelContext(**model_options), 
             solver=AcadosSolverOptionsContext(**solver_options), 
+            formulation=AcadosFormulationContext(
+                **{k: v for k, v in {**cost_options, **constraints_options}.items() if k in AcadosFormulationContext.model_fields}
+            ),
             constraints=AcadosConstraintsContext.values_only(**constraints_options), 
             weights=AcadosWeightsContext.values_only(**processed_weights), 
             slacks=AcadosSlackContext.values_only(**processed_slacks), 
@@ -4,7 +4,7 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 from .pkg_context import PackageContext
-from .ros_context import RosContext, PublisherContext, SubscriberContext
+from .ros_context import RosContext, PublisherContext, SubscriberContext, TrajectoryContext
 from .acados_context import AcadosContext
 from ..utils.jinja_utils import extract_pkg_from_type
 
@@ -18,6 +18,10 @@ class RosPackageContext(BaseModel):
         if self.package.dependencies is None:
             self.package.dependencies = set()
         self.add_msg_dependencies(self.ros.publishers + self.ros.subscribers)
+        if self.ros.trajectory.enabled:
+            self.add_msg_dependencies([self.ros.trajectory])
+        if self.ros.trajectory.enabled and self.package.solver_pool.size > 1:
+            raise ValueError("Stage-varying trajectories are not supported with a solver pool, set ros.trajectory.yref/parameters to false.")
 
     @classmethod
     def from_json(cls, config_path: str | Path) -> 'RosPackageContext':
@@ -30,7 +34,7 @@ class RosPackageContext(BaseModel):
             config_data: dict[str, Any] = yaml.safe_load(f)
         return cls.model_validate(config_data)
 
-    def add_msg_dependencies(self, pub_sub: list[PublisherContext | SubscriberContext]):
+    def add_msg_dependencies(self, pub_sub: list[PublisherContext | SubscriberContext | TrajectoryContext]):
         for item in pub_sub:
             pkg = extract_pkg_from_type(item.msg_type)
             if pkg:
@@ -1,8 +1,77 @@
 import logging
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 logger = logging.getLogger(__name__)
 
+class RealtimeContext(BaseModel):
+    solver_thread: bool     = Field(default=False)
+    sched_priority: int     = Field(default=0, ge=0, le=99)
+    cpu_affinity: list[int] = Field(default_factory=list)
+    lock_memory: bool       = Field(default=False)
+    callback_threads: int   = Field(default=2, ge=1)
+
+
+class DiagnosticsContext(BaseModel):
+    enabled: bool         = Field(default=False)
+    topic: str            = "~/solver_statistics"
+    window_size: int      = Field(default=1000, ge=1)
+    publish_period: float = Field(default=1.0, gt=0.0)
+
+
+class MarkersContext(BaseModel):
+    rate: float   = Field(default=10.0, gt=0.0)
+    thread: bool  = Field(default=True)
+
+
+class IntraProcessContext(BaseModel):
+    enabled: bool         = Field(default=False)
+    loaned_messages: bool = Field(default=False)
+
+    @model_validator(mode="after")
+    def _check_loaned_messages(self):
+        if self.enabled and self.loaned_messages:
+            logger.warning("Loaned messages bypass the intra-process manager, they are only used by publishers without intra-process comms.")
+        return self
+
+
+class ComposableNodeContext(BaseModel):
+    package: str                = "robot_localization"
+    plugin: str                 = "robot_localization::Ekf"
+    name: str                   = "ekf_filter_node"
+    parameters: dict[str, Any]  = Field(default_factory=dict)
+    remappings: dict[str, str]  = Field(default_factory=dict)
+
+
+class ComponentContext(BaseModel):
+    enabled: bool         = Field(default=False)
+    container: str        = "control_container"
+    multithreaded: bool   = Field(default=True)
+    composed_nodes: list[ComposableNodeContext] = Field(default_factory=list)
+
+
+class SolverPoolContext(BaseModel):
+    size: int       = Field(default=1, ge=1)
+    threads: int    = Field(default=0, ge=0)
+    selection: Literal["first_success", "min_cost"] = "first_success"
+
+
+class BuildContext(BaseModel):
+    build_type: Literal["Release", "RelWithDebInfo", "Debug"] = "Release"
+    march: str          = ""           # compiler default, "native" only for binaries that run on the build machine
+    lto: bool           = Field(default=True)
+    static_solver: bool = Field(default=False)
+    pgo: bool           = Field(default=False)
+
+
+class DeadlineContext(BaseModel):
+    enabled: bool           = Field(default=False)
+    budget_fraction: float  = Field(default=0.8, gt=0.0, le=1.0)
+    timeout: bool           = Field(default=True)
+    iteration_cap: bool     = Field(default=True)
+    max_iter: int | None    = Field(default=None, ge=1)   # None: max_iter of the acados solver
+
+
 class PackageContext(BaseModel):
     name: str          = "my_package"
     version: str       = "0.0.1"
@@ -11,7 +80,16 @@ class PackageContext(BaseModel):
     author_name: str   = "Your Name"
     license: str       = "MY LICENSE"
     with_markers: bool = Field(default=False)
+    markers: MarkersContext = Field(default_factory=MarkersContext)
     dependencies: set[str] = Field(default_factory=set)
+    realtime: RealtimeContext = Field(default_factory=RealtimeContext)
+    diagnostics: DiagnosticsContext = Field(default_factory=DiagnosticsContext)
+    intra_process: IntraProcessContext = Field(default_factory=IntraProcessContext)
+    component: ComponentContext = Field(default_factory=ComponentContext)
+    solver_pool: SolverPoolContext = Field(default_factory=SolverPoolContext)
+    field_handles: bool = Field(default=True)
+    build: BuildContext = Field(default_factory=BuildContext)
+    deadline: DeadlineContext = Field(default_factory=DeadlineContext)
     
     @field_validator("dependencies", mode="before")
     @classmethod
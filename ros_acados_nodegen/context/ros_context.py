@@ -22,8 +22,22 @@ class PublisherContext(BaseModel):
     queue_size: int    = 10
     description: str   = "A publisher for my package"
 
+class TrajectoryContext(BaseModel):
+    yref: bool         = False
+    parameters: bool   = False
+    topic: str         = "~/trajectory"
+    msg_type: str      = "std_msgs/Float64MultiArray"
+    max_samples: int   = Field(default=100, ge=1)
+    interpolate: bool  = True
+    description: str   = "Stage-varying references and parameters, rows of [t, yref, p]"
+
+    @property
+    def enabled(self) -> bool:
+        return self.yref or self.parameters
+
 class RosContext(BaseModel):
     node_name: str = "generated_node"
     parameters: list[ParameterContext] = Field(default_factory=list)
     subscribers: list[SubscriberContext] = Field(default_factory=list)
-    publishers: list[PublisherContext] = Field(default_factory=list)
\ No newline at end of file
+    publishers: list[PublisherContext] = Field(default_factory=list)
+    trajectory: TrajectoryContext = Field(default_factory=TrajectoryContext)
\ No newline at end of file
@@ -1,11 +1,9 @@
 from pathlib import Path
 
-from .renderer.package_generator import *
-from .context import RosPackageContext, AcadosContext
 from .utils.context_utils import parse_dot_key_value, parse_args_values, deep_update
 
 
-def generate_ros_package(solver_path, install_path=None, config_path=None, **kwargs):
+def generate_ros_package(solver_path, install_path=None, config_path=None, force=False, **kwargs):
     """
     Generate a ROS package based on an Acados solver. 
     
@@ -17,10 +15,21 @@ def generate_ros_package(solver_path, install_path=None, config_path=None, **kwa
         Path to the installation directory.
     config_path : str, optional
         Path to the ROS package configuration YAML file.
+    force : bool, optional
+        Regenerate all files, even if the generation manifest reports unchanged inputs.
     **kwargs : dict
         Additional keyword arguments to override context values.  
         They must have dot-separated keys (e.g. "package.name").
+
+    Returns
+    -------
+    Path
+        Path of the generated package.
     """
+    # Imported here, so the CLI starts without loading pydantic, yaml and jinja
+    from .context import RosPackageContext, AcadosContext
+    from .renderer.package_generator import RosPackageGenerator
+
     if config_path:
         context = RosPackageContext.from_yaml(config_path)
     else:
@@ -38,20 +47,21 @@ def generate_ros_package(solver_path, install_path=None, config_path=None, **kwa
 
     # pprint(context.model_dump(mode="python"))
     generator = RosPackageGenerator(context, install_path)
-    generator.generate_all()
+    generator.generate_all(force=force)
+    return generator.package_path
 
 def main():
     import argparse
-    from pathlib import Path
     
     parser = argparse.ArgumentParser(description="Generate a ROS package from an Acados solver.")
     parser.add_argument("solver_json_path", type=Path, help="Path to the Acados solver JSON file.")
     parser.add_argument("config_path", type=Path, help="Path to the ROS package configuration YAML file.")
     parser.add_argument("--set", action="append", default=[], help="Override context values, e.g. --set package.name=mpc --set ros.node_name=mpc_node")
+    parser.add_argument("--force", action="store_true", help="Regenerate all files, even if the inputs did not change.")
     args = parser.parse_args()
 
     kwargs = parse_args_values(args.set)
-    generate_ros_package(args.solver_json_path, config_path=args.config_path, **kwargs)
+    generate_ros_package(args.solver_json_path, config_path=args.config_path, force=args.force, **kwargs)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,171 @@
+/*
+ * Micro-benchmark of an acados installation: dense BLASFEO kernels and a small HPIPM QP.
+ *
+ * Usage: acados_hw_benchmark [num_repetitions]
+ * The result is printed as one JSON object on stdout:
+ *   gemm/potrf: GFLOPs of blasfeo_dgemm_nt and blasfeo_dpotrf_l per matrix size,
+ *   qp: mean solve time and iterations of a box constrained dense QP.
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#include "blasfeo_d_aux_ext_dep.h"
+#include "blasfeo_d_aux.h"
+#include "blasfeo_d_blas.h"
+#include "hpipm_d_dense_qp.h"
+#include "hpipm_d_dense_qp_sol.h"
+#include "hpipm_d_dense_qp_ipm.h"
+
+#define NUM_SIZES 4
+#define QP_NV 40
+
+static const int sizes[NUM_SIZES] = {8, 24, 64, 128};
+
+static double elapsed_s(const struct timespec *start, const struct timespec *stop)
+{
+    return (stop->tv_sec - start->tv_sec) + (stop->tv_nsec - start->tv_nsec) * 1e-9;
+}
+
+static void random_matrix(int m, int n, double *A)
+{
+    for (int i = 0; i < m * n; i++)
+        A[i] = (double)rand() / RAND_MAX - 0.5;
+}
+
+/* C = A * A' + n * I, symmetric positive definite */
+static void spd_matrix(int n, const double *A, double *C)
+{
+    for (int i = 0; i < n; i++)
+        for (int j = 0; j < n; j++)
+        {
+            double sum = i == j ? n : 0.0;
+            for (int k = 0; k < n; k++)
+                sum += A[i + k * n] * A[j + k * n];
+            C[i + j * n] = sum;
+        }
+}
+
+static void bench_blasfeo(int n, int reps, double *gflops_gemm, double *gflops_potrf)
+{
+    double *A = malloc(n * n * sizeof(double));
+    double *C = malloc(n * n * sizeof(double));
+    random_matrix(n, n, A);
+    spd_matrix(n, A, C);
+
+    struct blasfeo_dmat sA, sC, sD;
+    blasfeo_allocate_dmat(n, n, &sA);
+    blasfeo_allocate_dmat(n, n, &sC);
+    blasfeo_allocate_dmat(n, n, &sD);
+    blasfeo_pack_dmat(n, n, A, n, &sA, 0, 0);
+    blasfeo_pack_dmat(n, n, C, n, &sC, 0, 0);
+
+    struct timespec start, stop;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (int r = 0; r < reps; r++)
+        blasfeo_dgemm_nt(n, n, n, 1.0, &sA, 0, 0, &sA, 0, 0, 0.0, &sD, 0, 0, &sD, 0, 0);
+    clock_gettime(CLOCK_MONOTONIC, &stop);
+    *gflops_gemm = 2.0 * n * n * n * reps / elapsed_s(&start, &stop) * 1e-9;
+
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (int r = 0; r < reps; r++)
+        blasfeo_dpotrf_l(n, &sC, 0, 0, &sD, 0, 0);
+    clock_gettime(CLOCK_MONOTONIC, &stop);
+    *gflops_potrf = 1.0 / 3.0 * n * n * n * reps / elapsed_s(&start, &stop) * 1e-9;
+
+    blasfeo_free_dmat(&sA);
+    blasfeo_free_dmat(&sC);
+    blasfeo_free_dmat(&sD);
+    free(A);
+    free(C);
+}
+
+/* min 0.5 x'Hx + g'x  s.t.  -1 <= x <= 1 */
+static void bench_hpipm(int reps, double *solve_us, int *iterations, int *status)
+{
+    const int nv = QP_NV;
+    double *M = malloc(nv * nv * sizeof(double));
+    double *H = malloc(nv * nv * sizeof(double));
+    double g[QP_NV], lb[QP_NV], ub[QP_NV];
+    int idxb[QP_NV];
+    random_matrix(nv, nv, M);
+    spd_matrix(nv, M, H);
+    for (int i = 0; i < nv; i++)
+    {
+        g[i] = 10.0 * ((double)rand() / RAND_MAX - 0.5);
+        lb[i] = -1.0;
+        ub[i] = 1.0;
+        idxb[i] = i;
+    }
+
+    struct d_dense_qp_dim dim;
+    void *dim_mem = malloc(d_dense_qp_dim_memsize());
+    d_dense_qp_dim_create(&dim, dim_mem);
+    d_dense_qp_dim_set_all(nv, 0, nv, 0, 0, 0, &dim);
+
+    struct d_dense_qp qp;
+    void *qp_mem = malloc(d_dense_qp_memsize(&dim));
+    d_dense_qp_create(&dim, &qp, qp_mem);
+    d_dense_qp_set_H(H, &qp);
+    d_dense_qp_set_g(g, &qp);
+    d_dense_qp_set_idxb(idxb, &qp);
+    d_dense_qp_set_lb(lb, &qp);
+    d_dense_qp_set_ub(ub, &qp);
+
+    struct d_dense_qp_sol sol;
+    void *sol_mem = malloc(d_dense_qp_sol_memsize(&dim));
+    d_dense_qp_sol_create(&dim, &sol, sol_mem);
+
+    struct d_dense_qp_ipm_arg arg;
+    void *arg_mem = malloc(d_dense_qp_ipm_arg_memsize(&dim));
+    d_dense_qp_ipm_arg_create(&dim, &arg, arg_mem);
+    d_dense_qp_ipm_arg_set_default(SPEED, &arg);
+
+    struct d_dense_qp_ipm_ws ws;
+    void *ws_mem = malloc(d_dense_qp_ipm_ws_memsize(&dim, &arg));
+    d_dense_qp_ipm_ws_create(&dim, &arg, &ws, ws_mem);
+
+    struct timespec start, stop;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (int r = 0; r < reps; r++)
+        d_dense_qp_ipm_solve(&qp, &sol, &arg, &ws);
+    clock_gettime(CLOCK_MONOTONIC, &stop);
+    *solve_us = elapsed_s(&start, &stop) / reps * 1e6;
+    d_dense_qp_ipm_get_iter(&ws, iterations);
+    d_dense_qp_ipm_get_status(&ws, status);
+
+    free(ws_mem);
+    free(arg_mem);
+    free(sol_mem);
+    free(qp_mem);
+    free(dim_mem);
+    free(H);
+    free(M);
+}
+
+int main(int argc, char **argv)
+{
+    int reps = argc > 1 ? atoi(argv[1]) : 1000;
+    srand(42);
+
+    printf("{\"gemm\": {");
+    double gflops_potrf[NUM_SIZES];
+    for (int s = 0; s < NUM_SIZES; s++)
+    {
+        double gflops_gemm;
+        /* Fewer repetitions for large matrices, so every size takes a similar time */
+        int size_reps = reps * 64 / sizes[s] + 1;
+        bench_blasfeo(sizes[s], size_reps, &gflops_gemm, &gflops_potrf[s]);
+        printf("%s\"%d\": %.3f", s ? ", " : "", sizes[s], gflops_gemm);
+    }
+    printf("}, \"potrf\": {");
+    for (int s = 0; s < NUM_SIZES; s++)
+        printf("%s\"%d\": %.3f", s ? ", " : "", sizes[s], gflops_potrf[s]);
+
+    double solve_us;
+    int iterations, status;
+    bench_hpipm(reps, &solve_us, &iterations, &status);
+    printf("}, \"qp\": {\"nv\": %d, \"solve_us\": %.3f, \"iterations\": %d, \"status\": %d}}\n",
+           QP_NV, solve_us, iterations, status);
+    return 0;
+}
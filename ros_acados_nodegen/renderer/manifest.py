@@ -0,0 +1,65 @@
+import json
+import hashlib
+import logging
+from typing import Any, Iterable
+from pathlib import Path
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.nodegen_manifest.json'
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _json_default(obj: Any):
+    """Deterministic JSON serialization for sets and paths."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    return str(obj)
+
+
+def hash_inputs(context_data: dict, files: Iterable[tuple[str, bytes]]) -> str:
+    """
+    Hash everything the generated package depends on.
+
+    Parameters
+    ----------
+    context_data: dict
+        The dumped render context (solver JSON, config and overrides).
+    files: Iterable[tuple[str, bytes]]
+        Named file contents, e.g. the templates and the copied scripts.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(context_data, sort_keys=True, default=_json_default).encode())
+    for name, data in sorted(files, key=lambda f: f[0]):
+        h.update(name.encode())
+        h.update(hash_bytes(data).encode())
+    return h.hexdigest()
+
+
+class GenerationManifest(BaseModel):
+    """Content hashes of the last generation, stored inside the generated package."""
+    input_hash: str = ""
+    files: dict[str, str] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> 'GenerationManifest':
+        if not path.exists():
+            return cls()
+        try:
+            return cls.model_validate_json(path.read_text())
+        except Exception:
+            logger.warning(f"Ignoring invalid generation manifest at '{path}'.")
+            return cls()
+
+    def save(self, path: Path):
+        path.write_text(self.model_dump_json(indent=2) + '\n')
+
+    def is_up_to_date(self, input_hash: str, package_path: Path) -> bool:
+        """True if the inputs are unchanged and all generated files still exist."""
+        if not self.input_hash or self.input_hash != input_hash:
+            return False
+        return all((package_path / rel).is_file() for rel in self.files)
@@ -1,11 +1,13 @@
+import os
 import jinja2
 import stat
-import shutil
 import logging
 from typing import Any
+from functools import lru_cache
 from pathlib import Path
 
 from .paths import TEMPLATES_DIR
+from .manifest import MANIFEST_NAME, GenerationManifest, hash_bytes, hash_inputs
 from ..context import RosPackageContext
 from ..utils.jinja_utils import *
 
@@ -17,16 +19,63 @@ SCRIPTS_DIR = 'scripts'
 CONFIG_DIR = 'config'
 LAUNCH_DIR = 'launch'
 
+CACHE_DIR_ENV = 'ROS_ACADOS_NODEGEN_CACHE_DIR'
+
 JINJA_SUFFIX = '.j2'
 NODE_H_TEMP_NAME = 'node.h' + JINJA_SUFFIX
 CONFIG_HPP_TEMP_NAME = 'config.hpp' + JINJA_SUFFIX
 MARKER_PUBLISHER_HPP_TEMP_NAME = 'marker_publisher.hpp' + JINJA_SUFFIX
 UTILS_HPP_TEMP_NAME = 'utils.hpp' + JINJA_SUFFIX
+SOLVER_STATISTICS_HPP_TEMP_NAME = 'solver_statistics.hpp' + JINJA_SUFFIX
+SOLVER_HPP_TEMP_NAME = 'solver.hpp' + JINJA_SUFFIX
+SOLVER_POOL_HPP_TEMP_NAME = 'solver_pool.hpp' + JINJA_SUFFIX
 NODE_CPP_TEMP_NAME = 'node.cpp' + JINJA_SUFFIX
+SOLVER_CPP_TEMP_NAME = 'solver.cpp' + JINJA_SUFFIX
 CMAKELISTS_TEMP_NAME = 'CMakeLists.txt' + JINJA_SUFFIX
 PACKAGE_XML_TEMP_NAME = 'package.xml' + JINJA_SUFFIX
 GENERATE_SOLVER_TEMP_NAME = 'generate_solver.sh' + JINJA_SUFFIX
+PGO_BUILD_TEMP_NAME = 'pgo_build.sh' + JINJA_SUFFIX
 README_MD_TEMP_NAME = 'README.md' + JINJA_SUFFIX
+COMPOSITION_LAUNCH_TEMP_NAME = 'composition.launch.py' + JINJA_SUFFIX
+
+
+def _bytecode_cache() -> jinja2.BytecodeCache | None:
+    """
+    On-disk cache of the compiled templates, so they are only parsed once across processes.
+    Entries are keyed by the template source checksum, changed templates are recompiled.
+    """
+    cache_dir = Path(os.environ.get(CACHE_DIR_ENV) or (Path.home() / '.cache' / 'ros_acados_nodegen')) / 'jinja'
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        logger.debug(f"Template cache directory '{cache_dir}' not writable, compiling templates in memory.")
+        return None
+    return jinja2.FileSystemBytecodeCache(str(cache_dir))
+
+
+@lru_cache(maxsize=None)
+def get_jinja_env() -> jinja2.Environment:
+    """Jinja environment with all filters, created once per process and shared by all generators."""
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=_bytecode_cache(),
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    env.filters['basename'] = jinja_basename_filter
+    env.filters['snake'] = snake_case
+    env.filters['cpp_type'] = cpp_type
+    env.filters['include_path'] = include_path
+    env.filters['pkg_from_type'] = extract_pkg_from_type
+    env.filters['diagonal'] = get_diagonal
+
+    env.globals['snake'] = snake_case
+    env.globals['cpp_type'] = cpp_type
+    env.globals['include_path'] = include_path
+    env.globals['pkg_from_type'] = extract_pkg_from_type
+    env.globals['basename'] = jinja_basename_filter
+    env.globals['diagonal'] = get_diagonal
+    return env
 
 
 class RosPackageGenerator:
@@ -44,47 +93,61 @@ class RosPackageGenerator:
         """
         self.context = context
         self.package_path = Path(install_path) / context.package.name
+        self._generated_files: dict[str, str] = {}
+        self._written_files: list[str] = []
 
-        self.jinja_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        self._setup_jinja_filters()
-
-    def _setup_jinja_filters(self):
-        self.jinja_env.filters['basename'] = jinja_basename_filter
-        self.jinja_env.filters['snake'] = snake_case
-        self.jinja_env.filters['cpp_type'] = cpp_type
-        self.jinja_env.filters['include_path'] = include_path
-        self.jinja_env.filters['pkg_from_type'] = extract_pkg_from_type
-        self.jinja_env.filters['basename'] = jinja_basename_filter
-        self.jinja_env.filters['diagonal'] = get_diagonal
-
-        self.jinja_env.globals['snake'] = snake_case
-        self.jinja_env.globals['cpp_type'] = cpp_type
-        self.jinja_env.globals['include_path'] = include_path
-        self.jinja_env.globals['pkg_from_type'] = extract_pkg_from_type
-        self.jinja_env.globals['basename'] = jinja_basename_filter
-        self.jinja_env.globals['diagonal'] = get_diagonal
+        self.jinja_env = get_jinja_env()
 
-    def copy_scripts_folder(self):
-        """Kopiert den gesamten Scripts-Ordner in das Zielpaket."""
+    def _source_scripts_dir(self) -> Path:
         source_scripts_dir = Path(self.context.script_path).parent
         if not source_scripts_dir.exists() and not source_scripts_dir.is_absolute():
             source_scripts_dir = (Path.cwd() / source_scripts_dir).resolve()
+        return source_scripts_dir
+
+    def _iter_scripts(self):
+        """Yields (relative path, content) of all files in the scripts folder."""
+        source_scripts_dir = self._source_scripts_dir()
+        if not source_scripts_dir.is_dir():
+            return
+        for path in sorted(source_scripts_dir.rglob('*')):
+            if path.is_file() and '__pycache__' not in path.parts:
+                yield path.relative_to(source_scripts_dir), path.read_bytes()
+
+    def _iter_templates(self):
+        """Yields (name, content) of all templates."""
+        for template in TEMPLATES_DIR.iterdir():
+            if template.name.endswith(JINJA_SUFFIX):
+                yield template.name, template.read_bytes()
 
-        dest_scripts_dir = self.package_path / SCRIPTS_DIR
+    def _input_hash(self) -> str:
+        """Hash of the render context, the templates and the scripts folder."""
+        files = [(f'templates/{name}', data) for name, data in self._iter_templates()]
+        files += [(f'{SCRIPTS_DIR}/{rel.as_posix()}', data) for rel, data in self._iter_scripts()]
+        return hash_inputs(self.context.model_dump(), files)
 
-        ignore_patterns = ['__pycache__']
+    def _write_file(self, relative_dest_path: Path, content: bytes, executable: bool = False):
+        """Writes the file only if its content changed, to keep the timestamps for colcon/CMake."""
+        file_path = self.package_path / relative_dest_path
+        self._generated_files[Path(relative_dest_path).as_posix()] = hash_bytes(content)
+
+        if not file_path.is_file() or file_path.read_bytes() != content:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(content)
+            self._written_files.append(Path(relative_dest_path).as_posix())
+
+        if executable:
+            file_path.chmod(file_path.stat().st_mode | stat.S_IEXEC)
+
+    def copy_scripts_folder(self):
+        """Kopiert den gesamten Scripts-Ordner in das Zielpaket."""
+        source_scripts_dir = self._source_scripts_dir()
         if source_scripts_dir.exists():
-            logger.debug(f"Copying scripts from '{source_scripts_dir}' to '{dest_scripts_dir}'...")
-            shutil.copytree(
-                source_scripts_dir, 
-                dest_scripts_dir, 
-                ignore=shutil.ignore_patterns(*ignore_patterns),
-                dirs_exist_ok=True
-            )
+            logger.debug(f"Copying scripts from '{source_scripts_dir}' to '{self.package_path / SCRIPTS_DIR}'...")
+            for rel, data in self._iter_scripts():
+                if (Path(SCRIPTS_DIR) / rel).as_posix() in self._generated_files:
+                    continue
+                executable = bool((source_scripts_dir / rel).stat().st_mode & stat.S_IEXEC)
+                self._write_file(Path(SCRIPTS_DIR) / rel, data, executable=executable)
         else:
             logger.warning(f"Source scripts directory not found at '{source_scripts_dir}'")
 
@@ -96,14 +159,7 @@ class RosPackageGenerator:
         """Helperfunction to generate a file based on templates and context."""
         template = self.jinja_env.get_template(template_name)
         rendered_content = template.render(**self.context.model_dump())
-        file_path = self.package_path / relative_dest_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(file_path, 'w') as f:
-            f.write(rendered_content)
-            
-        if executable:
-            file_path.chmod(file_path.stat().st_mode | stat.S_IEXEC)
+        self._write_file(relative_dest_path, rendered_content.encode(), executable=executable)
 
     def create_node_h(self):
         dest = Path(INCLUDE_DIR) / self.package_path.name / f'{self.context.ros.node_name}.h'
@@ -121,10 +177,26 @@ class RosPackageGenerator:
         dest = Path(INCLUDE_DIR) / self.package_path.name / UTILS_HPP_TEMP_NAME.strip(JINJA_SUFFIX)
         self._create_file_from_template(UTILS_HPP_TEMP_NAME, dest)
 
+    def create_solver_statistics_hpp(self):
+        dest = Path(INCLUDE_DIR) / self.package_path.name / SOLVER_STATISTICS_HPP_TEMP_NAME.strip(JINJA_SUFFIX)
+        self._create_file_from_template(SOLVER_STATISTICS_HPP_TEMP_NAME, dest)
+
+    def create_solver_hpp(self):
+        dest = Path(INCLUDE_DIR) / self.package_path.name / SOLVER_HPP_TEMP_NAME.strip(JINJA_SUFFIX)
+        self._create_file_from_template(SOLVER_HPP_TEMP_NAME, dest)
+
+    def create_solver_pool_hpp(self):
+        dest = Path(INCLUDE_DIR) / self.package_path.name / SOLVER_POOL_HPP_TEMP_NAME.strip(JINJA_SUFFIX)
+        self._create_file_from_template(SOLVER_POOL_HPP_TEMP_NAME, dest)
+
     def create_node_cpp(self):
         dest = Path(SRC_DIR) / f'{self.context.ros.node_name}.cpp'
         self._create_file_from_template(NODE_CPP_TEMP_NAME, dest)
 
+    def create_solver_cpp(self):
+        dest = Path(SRC_DIR) / SOLVER_CPP_TEMP_NAME.strip(JINJA_SUFFIX)
+        self._create_file_from_template(SOLVER_CPP_TEMP_NAME, dest)
+
     def create_cmakelists_txt(self):
         dest = Path(CMAKELISTS_TEMP_NAME.strip(JINJA_SUFFIX))
         self._create_file_from_template(CMAKELISTS_TEMP_NAME, dest)
@@ -137,19 +209,68 @@ class RosPackageGenerator:
         dest = Path(SCRIPTS_DIR) / GENERATE_SOLVER_TEMP_NAME.strip(JINJA_SUFFIX)
         self._create_file_from_template(GENERATE_SOLVER_TEMP_NAME, dest, executable=True)
 
+    def create_pgo_build_sh(self):
+        dest = Path(SCRIPTS_DIR) / PGO_BUILD_TEMP_NAME.strip(JINJA_SUFFIX)
+        self._create_file_from_template(PGO_BUILD_TEMP_NAME, dest, executable=True)
+
+    def create_composition_launch_py(self):
+        dest = Path(LAUNCH_DIR) / f'{self.context.ros.node_name}_composition.launch.py'
+        self._create_file_from_template(COMPOSITION_LAUNCH_TEMP_NAME, dest)
+
     def create_readme_md(self):
         dest = Path(README_MD_TEMP_NAME.strip(JINJA_SUFFIX))
         self._create_file_from_template(README_MD_TEMP_NAME, dest)
 
-    def generate_all(self):
+    def _remove_stale_files(self, previous: GenerationManifest):
+        """Removes files of the previous generation, which are not generated anymore."""
+        for rel in previous.files:
+            if rel not in self._generated_files:
+                stale = self.package_path / rel
+                if stale.is_file():
+                    logger.debug(f"Removing stale file '{stale}'.")
+                    stale.unlink()
+
+    def generate_all(self, force: bool = False):
+        """
+        Generates the package, only files with changed content are written.
+
+        Parameters
+        ----------
+        force: bool
+            Regenerate even if the manifest reports unchanged inputs.
+        """
+        manifest_path = self.package_path / MANIFEST_NAME
+        previous = GenerationManifest.load(manifest_path)
+        input_hash = self._input_hash()
+        if not force and previous.is_up_to_date(input_hash, self.package_path):
+            logger.info(f"ROS package '{self.package_path.name}' is up to date.")
+            return
+
         logger.info(f"Generating ROS package '{self.package_path.name}'...")
-        self.copy_scripts_folder()
+        self._generated_files.clear()
+        self._written_files.clear()
         self.create_node_h()
         self.create_config_hpp()
         self.create_marker_publisher_hpp()
         self.create_utils_hpp()
+        if self.context.package.diagnostics.enabled:
+            self.create_solver_statistics_hpp()
+        self.create_solver_hpp()
+        if self.context.package.solver_pool.size > 1:
+            self.create_solver_pool_hpp()
         self.create_node_cpp()
+        self.create_solver_cpp()
         self.create_cmakelists_txt()
         self.create_package_xml()
         self.create_generator_sh()
-        self.create_readme_md()
\ No newline at end of file
+        if self.context.package.build.pgo:
+            self.create_pgo_build_sh()
+        if self.context.package.component.enabled:
+            self.create_composition_launch_py()
+        self.create_readme_md()
+        # Generated files take precedence over files of the same name in the scripts folder
+        self.copy_scripts_folder()
+
+        self._remove_stale_files(previous)
+        GenerationManifest(input_hash=input_hash, files=self._generated_files).save(manifest_path)
+        logger.info(f"Wrote {len(self._written_files)} of {len(self._generated_files)} files.")
@@ -0,0 +1,106 @@
+"""
+Shared helpers of the tests.
+
+The end-to-end tests export the double integrator solver with acados_template and build the generated
+package with colcon. They are skipped if ROS 2, colcon, acados or the acados venv are not available.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ros_acados_nodegen import generate_ros_package
+
+DATA_DIR = Path(__file__).parent / "data"
+OCP_SCRIPT = DATA_DIR / "double_integrator_ocp.py"
+VENV_PATH = Path(os.environ.get("VENV_PATH", Path.home() / ".acados_env"))
+
+
+def _missing_ros_acados() -> str | None:
+    if shutil.which("colcon") is None:
+        return "colcon not found"
+    if "ROS_DISTRO" not in os.environ:
+        return "ROS 2 is not sourced"
+    if "ACADOS_SOURCE_DIR" not in os.environ:
+        return "ACADOS_SOURCE_DIR is not set"
+    if not (VENV_PATH / "bin" / "python").is_file():
+        return f"no acados venv at {VENV_PATH}"
+    return None
+
+
+requires_ros_acados = pytest.mark.skipif(
+    _missing_ros_acados() is not None,
+    reason=_missing_ros_acados() or "",
+)
+
+
+def write_ocp_script(scripts_dir: Path, nlp_solver_type: str) -> Path:
+    """Copies the OCP script into scripts_dir, with the given NLP solver type."""
+    scripts_dir.mkdir(parents=True, exist_ok=True)
+    script = scripts_dir / OCP_SCRIPT.name
+    source = OCP_SCRIPT.read_text()
+    script.write_text(source.replace('NLP_SOLVER_TYPE = "SQP_RTI"', f'NLP_SOLVER_TYPE = "{nlp_solver_type}"'))
+    return script
+
+
+def render_package(tmp_path: Path, nlp_solver_type: str, solver_json: Path | None = None, **overrides) -> Path:
+    """
+    Generates the double integrator package into tmp_path/ws/src.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Root of the test directory.
+    nlp_solver_type : str
+        "SQP" or "SQP_RTI".
+    solver_json : Path, optional
+        Exported solver JSON, defaults to the synthetic benchmark JSON, which is enough for rendering.
+    **overrides : dict
+        Dot-separated context overrides, e.g. {"package.solver_pool.size": 3}.
+
+    Returns
+    -------
+    Path
+        Path of the generated package.
+    """
+    script = write_ocp_script(tmp_path / "scripts", nlp_solver_type)
+    if solver_json is None:
+        from benchmarks.bench_generator import synthetic_solver_json
+        solver_json = synthetic_solver_json(tmp_path / "solver.json", num_obstacles=0, N_horizon=20)
+
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({
+        "script_path": str(script),
+        "package": {"name": "di_mpc"},
+        "ros": {"node_name": "di_mpc_node"},
+    }))
+    overrides = {"acados.solver.nlp_solver_type": nlp_solver_type, **overrides}
+    return generate_ros_package(solver_json, install_path=tmp_path / "ws" / "src",
+                                config_path=config, **overrides)
+
+
+def export_solver(tmp_path: Path, nlp_solver_type: str) -> Path:
+    """Runs the OCP script in the acados venv and returns the exported solver JSON."""
+    script = write_ocp_script(tmp_path / "export", nlp_solver_type)
+    export_dir = tmp_path / "export" / "c_generated_code"
+    subprocess.run([str(VENV_PATH / "bin" / "python"), str(script), "--acados_code_export_path", str(export_dir)],
+                   cwd=tmp_path / "export", check=True)
+    return export_dir / "double_integrator_ocp.json"
+
+
+def colcon_build(ws: Path, *packages: str):
+    """Builds the given packages of the workspace ws."""
+    subprocess.run(["colcon", "build", "--packages-select", *packages,
+                    "--cmake-args", f"-DVENV_PATH={VENV_PATH}"],
+                   cwd=ws, check=True)
+
+
+def run_in_workspace(ws: Path, command: str, timeout: float | None = None) -> subprocess.CompletedProcess:
+    """Runs command in bash with the install space of ws sourced."""
+    return subprocess.run(["bash", "-c", f"source install/setup.bash && {command}"],
+                          cwd=ws, capture_output=True, text=True, timeout=timeout)
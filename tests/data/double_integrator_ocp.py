@@ -0,0 +1,67 @@
+"""
+Double integrator OCP of the end-to-end tests.
+
+Called like the OCP scripts of real packages by scripts/generate_solver.sh of the generated package,
+the tests run it once beforehand for the solver JSON. The tests replace NLP_SOLVER_TYPE in a copy of this file.
+"""
+import os
+import argparse
+import numpy as np
+import casadi as ca
+from acados_template import AcadosModel, AcadosOcp, AcadosOcpSolver, builders
+
+NLP_SOLVER_TYPE = "SQP_RTI"
+MODEL_NAME = "double_integrator"
+
+
+def create_ocp(nlp_solver_type: str, N_horizon: int = 20, tf: float = 1.0) -> AcadosOcp:
+    model = AcadosModel()
+    model.name = MODEL_NAME
+    model.x = ca.SX.sym("x", 2)
+    model.u = ca.SX.sym("u", 1)
+    model.f_expl_expr = ca.vertcat(model.x[1], model.u[0])
+
+    ocp = AcadosOcp()
+    ocp.model = model
+
+    # Drive position and velocity to zero with little input effort
+    ocp.cost.cost_type_0 = "LINEAR_LS"
+    ocp.cost.cost_type = "LINEAR_LS"
+    ocp.cost.cost_type_e = "LINEAR_LS"
+    ocp.cost.Vx_0 = ocp.cost.Vx = np.vstack((np.eye(2), np.zeros((1, 2))))
+    ocp.cost.Vu_0 = ocp.cost.Vu = np.array([[0.0], [0.0], [1.0]])
+    ocp.cost.W_0 = ocp.cost.W = np.diag([10.0, 1.0, 0.1])
+    ocp.cost.yref_0 = ocp.cost.yref = np.zeros(3)
+    ocp.cost.Vx_e = np.eye(2)
+    ocp.cost.W_e = np.diag([10.0, 1.0])
+    ocp.cost.yref_e = np.zeros(2)
+
+    ocp.constraints.x0 = np.zeros(2)
+    ocp.constraints.lbu = np.array([-1.0])
+    ocp.constraints.ubu = np.array([1.0])
+    ocp.constraints.idxbu = np.array([0])
+
+    ocp.solver_options.qp_solver = "PARTIAL_CONDENSING_HPIPM"
+    ocp.solver_options.hessian_approx = "GAUSS_NEWTON"
+    ocp.solver_options.integrator_type = "ERK"
+    ocp.solver_options.nlp_solver_type = nlp_solver_type
+    ocp.solver_options.N_horizon = N_horizon
+    ocp.solver_options.tf = tf
+    return ocp
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the double integrator solver.")
+    parser.add_argument("--acados_code_export_path", type=str, required=True)
+    args = parser.parse_args()
+
+    ocp = create_ocp(NLP_SOLVER_TYPE)
+    ocp.code_export_directory = args.acados_code_export_path
+    cm_builder = builders.ocp_get_default_cmake_builder()
+    cm_builder.options_on = ["BUILD_ACADOS_OCP_SOLVER_LIB"]
+    json_file = os.path.join(args.acados_code_export_path, f"{MODEL_NAME}_ocp.json")
+    AcadosOcpSolver(ocp, json_file=json_file, cmake_builder=cm_builder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Batch manifests: packages that would be written to the same directory are rejected before generation.
+"""
+from __future__ import annotations
+
+import pytest
+
+from ros_acados_nodegen.batch import BatchManifest
+
+
+def manifest(tmp_path, packages: list[dict]) -> BatchManifest:
+    return BatchManifest.model_validate({"packages": [{"solver_path": tmp_path / "solver.json", **p} for p in packages]})
+
+
+def test_same_name_in_different_install_paths_is_accepted(tmp_path):
+    batch = manifest(tmp_path, [
+        {"install_path": tmp_path / "a", "overrides": {"package.name": "mpc"}},
+        {"install_path": tmp_path / "b", "overrides": {"package.name": "mpc"}},
+    ])
+    batch.check_unique_packages()
+
+
+def test_same_resolved_path_is_rejected(tmp_path):
+    batch = manifest(tmp_path, [
+        {"install_path": tmp_path / "a", "overrides": {"package.name": "mpc"}},
+        {"install_path": tmp_path / "b" / ".." / "a", "overrides": {"package.name": "mpc"}},
+    ])
+    with pytest.raises(ValueError, match=r"packages\[1\] and packages\[0\] both generate 'mpc'"):
+        batch.check_unique_packages()
+
+
+def test_name_from_config_and_override_collide(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("package:\n  name: mpc\n")
+    batch = manifest(tmp_path, [
+        {"install_path": tmp_path, "config_path": config},
+        {"install_path": tmp_path, "overrides": {"package.name": "mpc"}},
+    ])
+    with pytest.raises(ValueError):
+        batch.check_unique_packages()
@@ -0,0 +1,105 @@
+"""
+Batched closed-loop simulation of the safety filter example, with the acados solvers replaced by a fake
+closed loop, and the round trip of the results through BatchResults.save / BatchResults.load.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from safety_filter_scripts.safety_filter_ocp import batch_simulation
+from safety_filter_scripts.safety_filter_ocp.batch_simulation import BatchResults, Scenario, simulate_batch
+from safety_filter_scripts.safety_filter_ocp.helper import MapInfo
+
+NX, NU, N_SIM = 3, 2, 6
+FAILED_STEP = 2
+
+
+class FakeOcpSolver:
+    def __init__(self):
+        self.acados_ocp = SimpleNamespace(
+            dims=SimpleNamespace(nx=NX, nu=NU),
+            cost=SimpleNamespace(W_0=np.eye(2 * NU), W=np.eye(NU)),
+            solver_options=SimpleNamespace(N_horizon=4),
+        )
+
+    def reset(self):
+        pass
+
+    def cost_set(self, stage, field_, value):
+        pass
+
+
+def fake_simulate(init_state, unsafe_inputs, map_info, safety_radius, ocp_solver, sim_solver, N_sim,
+                  obstacle_encoding):
+    """Moves the state by the unsafe input, scenarios with a negative safety radius fail at FAILED_STEP."""
+    x_sim = np.full((N_sim + 1, NX), np.nan)
+    u_traj = np.full((N_sim, 4, NU), np.nan)
+    x_sim[0] = init_state
+    for k in range(N_sim if safety_radius >= 0 else FAILED_STEP):
+        u_traj[k, 0] = unsafe_inputs[k]
+        x_sim[k + 1] = x_sim[k] + np.r_[unsafe_inputs[k], 0.0]
+    return None, u_traj, x_sim
+
+
+@pytest.fixture
+def fake_solvers(monkeypatch):
+    monkeypatch.setattr(batch_simulation, "_create_solvers", lambda *args, **kwargs: (FakeOcpSolver(), None))
+    monkeypatch.setattr(batch_simulation, "simulate", fake_simulate)
+
+
+def scenarios(count: int) -> list[Scenario]:
+    map_info = MapInfo(origin=np.zeros(2), grid=np.zeros((4, 4)), resolution=0.1)
+    return [
+        Scenario(
+            init_state=np.full(NX, float(i)),
+            unsafe_inputs=np.full((N_SIM, NU), 0.1 * i),
+            map_info=map_info,
+            safety_radius=-1.0 if i % 3 == 2 else 0.3,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 2, 7])
+def test_results_are_stored_in_scenario_order(fake_solvers, chunk_size):
+    batch = scenarios(7)
+    results = simulate_batch(batch, solver_kwargs={}, N_sim=N_SIM, obstacle_encoding="circles",
+                             max_workers=1, chunk_size=chunk_size)
+
+    assert results.x_sim.shape == (7, N_SIM + 1, NX)
+    assert results.u_sim.shape == (7, N_SIM, NU)
+    np.testing.assert_array_equal(results.x_sim[:, 0, 0], np.arange(7))
+    np.testing.assert_array_equal(results.num_steps, [N_SIM, N_SIM, FAILED_STEP] * 2 + [N_SIM])
+    np.testing.assert_array_equal(results.success, [True, True, False] * 2 + [True])
+    assert np.isnan(results.x_sim[2, FAILED_STEP + 1:]).all()
+    assert np.isnan(results.u_sim[2, FAILED_STEP:]).all()
+    np.testing.assert_allclose(results.u_sim[4], 0.4)
+    assert results.metadata == {"N_sim": N_SIM, "obstacle_encoding": "circles"}
+
+
+def test_empty_batch(fake_solvers):
+    results = simulate_batch([], solver_kwargs={}, N_sim=N_SIM)
+    assert results.x_sim.shape == (0, N_SIM + 1, NX)
+    assert results.success.shape == (0,)
+
+
+def test_save_load_round_trip(fake_solvers, tmp_path):
+    results = simulate_batch(scenarios(4), solver_kwargs={}, N_sim=N_SIM, obstacle_encoding="distance_field",
+                             max_workers=1)
+    results.metadata["safety_radii"] = np.array([0.3, 0.3, -1.0, 0.3])
+    path = tmp_path / "results.npz"
+    results.save(path)
+
+    loaded = BatchResults.load(path)
+    for name in ("x_sim", "u_sim", "num_steps", "duration"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(results, name))
+    np.testing.assert_array_equal(loaded.success, results.success)
+
+    # Scalars and strings come back as Python objects, arrays stay arrays
+    assert loaded.metadata["N_sim"] == N_SIM and isinstance(loaded.metadata["N_sim"], int)
+    assert loaded.metadata["obstacle_encoding"] == "distance_field"
+    assert isinstance(loaded.metadata["obstacle_encoding"], str)
+    np.testing.assert_array_equal(loaded.metadata["safety_radii"], results.metadata["safety_radii"])
@@ -0,0 +1,44 @@
+"""
+Deadline mode of full SQP nodes.
+"""
+import json
+
+from conftest import requires_ros_acados, render_package, export_solver, colcon_build, run_in_workspace
+
+POOL_OVERRIDES = {
+    "package.solver_pool.size": 3,
+    "package.solver_pool.threads": 1,
+    "package.deadline.enabled": True,
+    "package.realtime.solver_thread": True,
+}
+
+
+@requires_ros_acados
+def test_pool_with_fewer_threads_than_instances_meets_deadline(tmp_path):
+    solver_json = export_solver(tmp_path, "SQP")
+    package_path = render_package(tmp_path, "SQP", solver_json=solver_json, **POOL_OVERRIDES)
+    ws = package_path.parent.parent
+    colcon_build(ws, "di_mpc")
+
+    result = run_in_workspace(
+        ws, "timeout -s INT 3 ros2 run di_mpc di_mpc_node --ros-args -p di_mpc.solver.Tsim:=0.005", timeout=30)
+    output = result.stdout + result.stderr
+    assert "Solver instance" not in output, output
+    assert "missed its deadline" not in output, output
+
+
+def test_iteration_cap_is_bounded_by_solver_max_iter(tmp_path):
+    from benchmarks.bench_generator import synthetic_solver_json
+    solver_json = synthetic_solver_json(tmp_path / "solver.json", num_obstacles=0)
+    data = json.loads(solver_json.read_text())
+    data["solver_options"]["nlp_solver_max_iter"] = 20
+    solver_json.write_text(json.dumps(data))
+
+    def rendered_max_iter(**overrides) -> str:
+        package_path = render_package(tmp_path, "SQP", solver_json=solver_json, **POOL_OVERRIDES, **overrides)
+        config = (package_path / "include" / "di_mpc" / "config.hpp").read_text()
+        return config.split("int max_iter{ ")[1].split(" }")[0]
+
+    assert rendered_max_iter() == "20"
+    assert rendered_max_iter(**{"package.deadline.max_iter": 50}) == "20"
+    assert rendered_max_iter(**{"package.deadline.max_iter": 5}) == "5"
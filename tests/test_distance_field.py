@@ -0,0 +1,76 @@
+"""
+Distance field encoding of the safety filter example, compared against brute force on small maps.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from safety_filter_scripts.safety_filter_ocp.helper import MapInfo, compute_signed_distance_field, get_distance_patch
+from safety_filter_scripts.safety_filter_ocp.simulation import get_obstacle_parameters
+
+
+def random_map(seed: int, shape=(24, 30), density=0.1) -> MapInfo:
+    rng = np.random.default_rng(seed)
+    grid = (rng.random(shape) < density).astype(float)
+    return MapInfo(origin=np.array([-1.0, 0.5]), grid=grid, resolution=0.1)
+
+
+def brute_force_distance(grid: np.ndarray, resolution: float) -> np.ndarray:
+    """Signed distance of every cell center to the nearest cell center of the other kind."""
+    cells = np.indices(grid.shape).reshape(2, -1).T
+    occupied = (grid == 1).ravel()
+    distances = np.linalg.norm(cells[:, None, :] - cells[None, :, :], axis=2) * resolution
+    free_dist = np.where(occupied[None, :], distances, np.inf).min(axis=1)
+    occupied_dist = np.where(~occupied[None, :], distances, np.inf).min(axis=1)
+    return np.where(occupied, -occupied_dist, free_dist).reshape(grid.shape)
+
+
+def fake_solver(np_: int, nh: int) -> SimpleNamespace:
+    return SimpleNamespace(acados_ocp=SimpleNamespace(dims=SimpleNamespace(np=np_, nh=nh)))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_signed_distance_field_matches_brute_force(seed):
+    map_info = random_map(seed)
+    np.testing.assert_allclose(map_info.distance_field, brute_force_distance(map_info.grid, map_info.resolution))
+
+
+def test_empty_map_is_infinitely_far():
+    assert np.all(compute_signed_distance_field(np.zeros((4, 5)), 0.1) == np.inf)
+
+
+@pytest.mark.parametrize("robot_position", [[0.42, 1.57], [-0.95, 0.55], [1.95, 2.85], [5.0, 5.0]])
+def test_patch_values_at_patch_cell_centers(robot_position):
+    """Each patch value belongs to the cell center patch_origin + (col + 0.5, row + 0.5) * resolution."""
+    map_info = random_map(11)
+    num_cells = 9
+    far = num_cells * map_info.resolution
+    patch_origin, values = get_distance_patch(map_info, np.array(robot_position), num_cells)
+    assert values.shape == (num_cells**2,)
+
+    rows, cols = np.divmod(np.arange(num_cells**2), num_cells)
+    centers = patch_origin + (np.column_stack((cols, rows)) + 0.5) * map_info.resolution
+    map_cols, map_rows = np.floor((centers - map_info.origin) / map_info.resolution).astype(int).T
+    inside = (map_rows >= 0) & (map_rows < map_info.height) & (map_cols >= 0) & (map_cols < map_info.width)
+
+    expected = np.full(num_cells**2, far)
+    expected[inside] = np.minimum(map_info.distance_field[map_rows[inside], map_cols[inside]], far)
+    np.testing.assert_allclose(values, expected)
+
+
+def test_distance_field_parameters():
+    map_info = random_map(3)
+    num_cells, nh = 7, 5
+    robot_position = np.array([0.3, 1.2])
+    p_values, lh_values = get_obstacle_parameters(
+        fake_solver(4 + num_cells**2, nh), map_info, robot_position, safety_radius=0.25,
+        obstacle_encoding="distance_field",
+    )
+    patch_origin, values = get_distance_patch(map_info, robot_position, num_cells)
+    np.testing.assert_array_equal(p_values[:2], [0.2, 0.2])
+    np.testing.assert_array_equal(p_values[2:4], patch_origin)
+    np.testing.assert_array_equal(p_values[4:], values)
+    np.testing.assert_array_equal(lh_values, np.full(nh, 0.25))
@@ -0,0 +1,73 @@
+"""
+Incremental generation: unchanged files keep their timestamps, and the compiled templates are cached on disk.
+"""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from conftest import render_package
+from ros_acados_nodegen.renderer.manifest import MANIFEST_NAME
+from ros_acados_nodegen.renderer.package_generator import CACHE_DIR_ENV, get_jinja_env
+
+OLD_MTIME_NS = 1_000_000_000 * 10**9
+
+
+@pytest.fixture
+def jinja_cache_dir(tmp_path, monkeypatch):
+    """Fresh jinja environment with its bytecode cache in tmp_path."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    get_jinja_env.cache_clear()
+    yield cache_dir / "jinja"
+    get_jinja_env.cache_clear()
+
+
+def generated_files(package):
+    return sorted(p for p in package.rglob("*") if p.is_file() and p.name != MANIFEST_NAME)
+
+
+def age_files(package):
+    """Sets all generated files to an old timestamp, so any rewrite is visible."""
+    for path in generated_files(package):
+        os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def rewritten(package) -> set[str]:
+    return {path.relative_to(package).as_posix() for path in generated_files(package)
+            if path.stat().st_mtime_ns != OLD_MTIME_NS}
+
+
+def test_templates_are_compiled_into_the_cache_dir(tmp_path, jinja_cache_dir):
+    render_package(tmp_path, "SQP_RTI")
+    assert any(jinja_cache_dir.iterdir())
+
+
+def test_forced_regeneration_does_not_touch_unchanged_files(tmp_path, jinja_cache_dir):
+    package = render_package(tmp_path, "SQP_RTI")
+    age_files(package)
+
+    render_package(tmp_path, "SQP_RTI", force=True)
+    assert rewritten(package) == set()
+
+
+def test_only_missing_files_are_rewritten(tmp_path, jinja_cache_dir):
+    package = render_package(tmp_path, "SQP_RTI")
+    age_files(package)
+    (package / "CMakeLists.txt").unlink()
+
+    render_package(tmp_path, "SQP_RTI")
+    assert rewritten(package) == {"CMakeLists.txt"}
+
+
+def test_changed_inputs_add_and_remove_files(tmp_path, jinja_cache_dir):
+    package = render_package(tmp_path, "SQP_RTI")
+    pool_header = package / "include" / "di_mpc" / "solver_pool.hpp"
+    assert not pool_header.exists()
+
+    render_package(tmp_path, "SQP_RTI", **{"package.solver_pool.size": 2})
+    assert pool_header.is_file()
+
+    render_package(tmp_path, "SQP_RTI")
+    assert not pool_header.exists()
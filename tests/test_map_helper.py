@@ -0,0 +1,63 @@
+"""
+Obstacle queries of the safety filter example on small random maps, compared against brute force.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from safety_filter_scripts.safety_filter_ocp.helper import MapInfo, get_relevant_obstacles
+
+
+def random_map(seed: int, shape=(64, 80), density=0.05) -> MapInfo:
+    rng = np.random.default_rng(seed)
+    grid = (rng.random(shape) < density).astype(float)
+    return MapInfo(origin=np.array([-3.0, -2.0]), grid=grid, resolution=0.1)
+
+
+def brute_force_nearest(map_info: MapInfo, robot_position: np.ndarray, local_patch_size_m: float, k: int) -> np.ndarray:
+    """Distances of the k closest occupied cell centers in the local patch, as computed by get_relevant_obstacles."""
+    robot_col = int((robot_position[0] - map_info.origin[0]) / map_info.resolution)
+    robot_row = int((robot_position[1] - map_info.origin[1]) / map_info.resolution)
+    radius = int(local_patch_size_m / 2 / map_info.resolution)
+    rows, cols = np.nonzero(map_info.grid == 1)
+    inside = (
+        (rows >= max(0, robot_row - radius)) & (rows < min(map_info.height, robot_row + radius)) &
+        (cols >= max(0, robot_col - radius)) & (cols < min(map_info.width, robot_col + radius))
+    )
+    centers = map_info.cell_centers(rows[inside], cols[inside])
+    return np.sort(np.linalg.norm(centers - robot_position, axis=1))[:k]
+
+
+def assert_matches_brute_force(map_info: MapInfo, robot_position: np.ndarray, k: int = 10):
+    obstacles = get_relevant_obstacles(map_info, robot_position, local_patch_size_m=3.0, max_obstacles_to_return=k)
+    distances = np.linalg.norm(obstacles - robot_position, axis=1)
+    np.testing.assert_allclose(distances, brute_force_nearest(map_info, robot_position, 3.0, k))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_brute_force_after_update(seed):
+    map_info = random_map(seed)
+    rng = np.random.default_rng(100 + seed)
+    for _ in range(5):
+        # Patches that cross bucket borders, with obstacles added and removed
+        row, col = rng.integers(0, 50), rng.integers(0, 60)
+        patch = (rng.random((rng.integers(1, 14), rng.integers(1, 20))) < 0.3).astype(float)
+        map_info.update(patch, row, col)
+        for _ in range(5):
+            robot_position = map_info.origin + rng.random(2) * np.array([map_info.width, map_info.height]) * map_info.resolution
+            assert_matches_brute_force(map_info, robot_position)
+
+
+def test_cached_map_data_follows_update():
+    map_info = random_map(7)
+    positions = map_info.obstacle_positions
+    distance_field = map_info.distance_field
+    assert len(positions) == np.count_nonzero(map_info.grid == 1)
+
+    map_info.update(np.zeros((10, 10)), 0, 0)
+    map_info.update(np.ones((2, 3)), 20, 30)
+    expected = map_info.cell_centers(*np.nonzero(map_info.grid == 1))
+    np.testing.assert_array_equal(map_info.obstacle_positions, expected)
+    assert map_info.distance_field is not distance_field
+    assert map_info.distance_field[21, 31] < 0.0
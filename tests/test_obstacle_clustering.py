@@ -0,0 +1,104 @@
+"""
+Circle encoding of the safety filter example: clustered obstacle cells on small random maps.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from safety_filter_scripts.safety_filter_ocp.helper import MapInfo, cluster_obstacles
+from safety_filter_scripts.safety_filter_ocp.simulation import get_obstacle_parameters
+
+PATCH_SIZE_M = 5.0
+
+
+def random_map(seed: int, shape=(60, 70), density=0.04) -> MapInfo:
+    rng = np.random.default_rng(seed)
+    grid = (rng.random(shape) < density).astype(float)
+    # A wall, so that some components are larger than a single tile
+    grid[30, 10:40] = 1.0
+    return MapInfo(origin=np.array([-2.0, -1.0]), grid=grid, resolution=0.1)
+
+
+def free_robot_positions(map_info: MapInfo, seed: int, count: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rows, cols = np.nonzero(map_info.grid == 0)
+    picked = rng.choice(len(rows), size=count, replace=False)
+    return map_info.cell_centers(rows[picked], cols[picked])
+
+
+def patch_obstacle_centers(map_info: MapInfo, robot_position: np.ndarray) -> np.ndarray:
+    """Occupied cell centers in the local patch, with the same patch bounds as cluster_obstacles."""
+    robot_col = int((robot_position[0] - map_info.origin[0]) / map_info.resolution)
+    robot_row = int((robot_position[1] - map_info.origin[1]) / map_info.resolution)
+    radius = int(PATCH_SIZE_M / 2 / map_info.resolution)
+    rows, cols = np.nonzero(map_info.grid == 1)
+    inside = (
+        (rows >= max(0, robot_row - radius)) & (rows < min(map_info.height, robot_row + radius)) &
+        (cols >= max(0, robot_col - radius)) & (cols < min(map_info.width, robot_col + radius))
+    )
+    return map_info.cell_centers(rows[inside], cols[inside])
+
+
+def clearance(circles: np.ndarray, robot_position: np.ndarray) -> np.ndarray:
+    return np.linalg.norm(circles[:, :2] - robot_position, axis=1) - circles[:, 2]
+
+
+def fake_solver(num_obs: int) -> SimpleNamespace:
+    dims = SimpleNamespace(np=2 + 3 * num_obs, nh=2 * num_obs)
+    return SimpleNamespace(acados_ocp=SimpleNamespace(dims=dims))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_circles_never_overestimate_the_clearance(seed):
+    map_info = random_map(seed)
+    for robot_position in free_robot_positions(map_info, seed):
+        circles = cluster_obstacles(map_info, robot_position, PATCH_SIZE_M, max_obstacles_to_return=6)
+        centers = patch_obstacle_centers(map_info, robot_position)
+        assert circles.shape[1] == 3
+        assert 0 < len(circles) <= 6
+
+        distances = clearance(circles, robot_position)
+        assert np.all(np.diff(distances) >= 0.0)
+        assert distances[0] <= np.linalg.norm(centers - robot_position, axis=1).min() + 1e-12
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_closest_cell_is_covered_by_a_circle(seed):
+    map_info = random_map(seed)
+    robot_position = free_robot_positions(map_info, seed, count=1)[0]
+    circles = cluster_obstacles(map_info, robot_position, PATCH_SIZE_M, max_obstacles_to_return=10_000)
+    centers = patch_obstacle_centers(map_info, robot_position)
+
+    closest = centers[np.argmin(np.linalg.norm(centers - robot_position, axis=1))]
+    covered = np.linalg.norm(circles[:, :2] - closest, axis=1) <= circles[:, 2] + 1e-12
+    assert covered.any()
+    # Far fewer circles than cells, the wall is not split into one circle per cell
+    assert len(circles) < len(centers)
+
+
+def test_empty_patch_has_no_circles():
+    map_info = MapInfo(origin=np.zeros(2), grid=np.zeros((20, 20)), resolution=0.1)
+    assert cluster_obstacles(map_info, np.array([1.0, 1.0]), PATCH_SIZE_M, 4).shape == (0, 3)
+
+    p_values, lh_values = get_obstacle_parameters(fake_solver(4), map_info, np.array([1.0, 1.0]), 0.3, "circles")
+    np.testing.assert_array_equal(p_values, np.r_[0.2, 0.2, np.zeros(12)])
+    np.testing.assert_array_equal(lh_values, np.full(8, -1e1))
+
+
+def test_circle_parameters():
+    grid = np.zeros((20, 20))
+    grid[5, 5] = 1.0
+    grid[14, 12:16] = 1.0
+    map_info = MapInfo(origin=np.zeros(2), grid=grid, resolution=0.1)
+    robot_position = np.array([1.0, 1.0])
+
+    p_values, lh_values = get_obstacle_parameters(fake_solver(4), map_info, robot_position, 0.3, "circles")
+    circles = cluster_obstacles(map_info, robot_position, 50 * map_info.resolution, 4)
+    assert len(circles) == 2
+    np.testing.assert_array_equal(p_values[:2], [0.2, 0.2])
+    np.testing.assert_array_equal(p_values[2:8], circles.ravel())
+    np.testing.assert_array_equal(p_values[8:], 0.0)
+    np.testing.assert_array_equal(lh_values, [0.3] * 4 + [-1e1] * 4)
@@ -0,0 +1,74 @@
+"""
+The exported <package>::<package>_solver target has to be usable from other packages of the workspace.
+"""
+import shutil
+from pathlib import Path
+
+from conftest import requires_ros_acados, render_package, export_solver, colcon_build, run_in_workspace
+
+CONSUMER_PACKAGE_XML = """<?xml version="1.0"?>
+<package format="3">
+  <name>di_consumer</name>
+  <version>0.0.1</version>
+  <description>Links the exported solver library of di_mpc.</description>
+  <maintainer email="test@example.com">test</maintainer>
+  <license>MIT</license>
+  <buildtool_depend>ament_cmake</buildtool_depend>
+  <depend>di_mpc</depend>
+  <export>
+    <build_type>ament_cmake</build_type>
+  </export>
+</package>
+"""
+
+CONSUMER_CMAKELISTS = """cmake_minimum_required(VERSION 3.8)
+project(di_consumer)
+
+find_package(ament_cmake REQUIRED)
+find_package(di_mpc REQUIRED)
+
+add_executable(consumer src/main.cpp)
+target_compile_features(consumer PUBLIC cxx_std_17)
+target_link_libraries(consumer di_mpc::di_mpc_solver)
+
+install(TARGETS consumer DESTINATION lib/${PROJECT_NAME})
+ament_package()
+"""
+
+CONSUMER_MAIN = """#include <cstdio>
+#include "di_mpc/solver.hpp"
+
+int main() {
+    di_mpc::DiMpcNodeSolver solver;
+    solver.set_x0({ 1.0, 0.0 });
+    const int status = solver.ocp_solve();
+    const auto u0 = solver.get_input(0);
+    std::printf("status %d u0 %f\\n", status, u0[0]);
+    return status;
+}
+"""
+
+
+def write_consumer(src: Path):
+    package = src / "di_consumer"
+    (package / "src").mkdir(parents=True)
+    (package / "package.xml").write_text(CONSUMER_PACKAGE_XML)
+    (package / "CMakeLists.txt").write_text(CONSUMER_CMAKELISTS)
+    (package / "src" / "main.cpp").write_text(CONSUMER_MAIN)
+
+
+@requires_ros_acados
+def test_consumer_links_installed_solver_target(tmp_path):
+    solver_json = export_solver(tmp_path, "SQP")
+    package_path = render_package(tmp_path, "SQP", solver_json=solver_json)
+    ws = package_path.parent.parent
+    colcon_build(ws, "di_mpc")
+
+    # The consumer must only need the install space, not the build tree of the solver package
+    shutil.rmtree(ws / "build" / "di_mpc")
+    write_consumer(ws / "src")
+    colcon_build(ws, "di_consumer")
+
+    result = run_in_workspace(ws, "ros2 run di_consumer consumer", timeout=60)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "status 0" in result.stdout
@@ -0,0 +1,58 @@
+"""
+The rendered solver_statistics.hpp only needs the standard library, it is compiled and run against recorded cycles.
+"""
+from __future__ import annotations
+
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import render_package
+
+CXX = shutil.which("g++") or shutil.which("clang++")
+
+STATISTICS_MAIN = r"""
+#include <cstdio>
+#include "di_mpc/solver_statistics.hpp"
+
+using namespace di_mpc;
+
+CycleStatistics cycle(int status, bool usable, double total_ms) {
+    CycleStatistics c;
+    c.status = status;
+    c.usable = usable;
+    c.phase_ms[static_cast<size_t>(TimingPhase::TOTAL)] = total_ms;
+    return c;
+}
+
+int main() {
+    SolverStatistics<8> statistics(10.0);
+    statistics.record(cycle(0, true, 1.0));     // converged
+    statistics.record(cycle(2, true, 9.0));     // iteration cap, last iterate published
+    statistics.record(cycle(7, true, 9.5));     // timeout, last iterate published
+    statistics.record(cycle(4, false, 2.0));    // QP failure
+    statistics.record(cycle(0, true, 12.0));    // converged, but too late
+    const auto summary = statistics.evaluate();
+    std::printf("%llu %llu %llu %llu\n",
+        static_cast<unsigned long long>(summary.total_cycles),
+        static_cast<unsigned long long>(summary.solver_failures),
+        static_cast<unsigned long long>(summary.early_stops),
+        static_cast<unsigned long long>(summary.deadline_misses));
+    return 0;
+}
+"""
+
+
+@pytest.mark.skipif(CXX is None, reason="no C++ compiler")
+def test_early_stops_are_not_counted_as_failures(tmp_path):
+    package_path = render_package(tmp_path, "SQP", **{"package.diagnostics.enabled": True, "package.deadline.enabled": True})
+    main = tmp_path / "main.cpp"
+    main.write_text(STATISTICS_MAIN)
+    binary = tmp_path / "statistics"
+    subprocess.run([CXX, "-std=c++17", "-Wall", "-Werror", "-I", str(package_path / "include"),
+                    str(main), "-o", str(binary), "-pthread"], check=True)
+
+    result = subprocess.run([str(binary)], capture_output=True, text=True, check=True)
+    total, failures, early_stops, deadline_misses = map(int, result.stdout.split())
+    assert (total, failures, early_stops, deadline_misses) == (5, 1, 2, 1)